@@ -107,7 +107,7 @@ if [[ -z "$RUNTIME" ]]; then
             fi
         fi
 
-        # Install minimal dependencies (skip transformers — token counting uses char-based fallback)
+        # Install minimal dependencies (skip tokenizers — token counting uses char-based fallback)
         if [[ "$PKG_MGR" == "uv" ]]; then
             uv pip install --python "${VENV_DIR}/bin/python" mcp aiohttp || {
                 echo "Error: Failed to install dependencies with uv." >&2
@@ -75,39 +75,40 @@ class EvictionManager:
             "deleted": 0,
         }
 
-        # Process batch of lowest priority memories
-        for mem in sorted_memories[: self.config.batch_size]:
-            memory_id = mem["id"]
-            current_phase = mem.get("phase", 0)
-
-            if current_phase >= 3:
-                continue  # Already removed
-
-            try:
-                if current_phase == 0:
-                    # Phase 0 -> 1: Archive and reduce to hint
-                    if self._archive_memory(memory_id):
-                        stats["archived"] += 1
-                    self._reduce_to_hint(memory_id)
-                    self.store.update(memory_id, phase=1)
-                    stats["phase_transitions"]["0_to_1"] += 1
-
-                elif current_phase == 1:
-                    # Phase 1 -> 2: Reduce to abstract
-                    self._reduce_to_abstract(memory_id)
-                    self.store.update(memory_id, phase=2)
-                    stats["phase_transitions"]["1_to_2"] += 1
-
-                elif current_phase == 2:
-                    # Phase 2 -> 3: Remove from active storage
-                    self.store.delete(memory_id, archive=False)  # Already archived
-                    stats["phase_transitions"]["2_to_3"] += 1
-                    stats["deleted"] += 1
-
-                stats["processed"] += 1
-
-            except Exception:
-                pass  # Skip problematic memories
+        # Process batch of lowest priority memories, writing index/stats once
+        with self.store.batch():
+            for mem in sorted_memories[: self.config.batch_size]:
+                memory_id = mem["id"]
+                current_phase = mem.get("phase", 0)
+
+                if current_phase >= 3:
+                    continue  # Already removed
+
+                try:
+                    if current_phase == 0:
+                        # Phase 0 -> 1: Archive and reduce to hint
+                        if self._archive_memory(memory_id):
+                            stats["archived"] += 1
+                        self._reduce_to_hint(memory_id)
+                        self.store.update(memory_id, phase=1)
+                        stats["phase_transitions"]["0_to_1"] += 1
+
+                    elif current_phase == 1:
+                        # Phase 1 -> 2: Reduce to abstract
+                        self._reduce_to_abstract(memory_id)
+                        self.store.update(memory_id, phase=2)
+                        stats["phase_transitions"]["1_to_2"] += 1
+
+                    elif current_phase == 2:
+                        # Phase 2 -> 3: Remove from active storage
+                        self.store.delete(memory_id, archive=False)  # Already archived
+                        stats["phase_transitions"]["2_to_3"] += 1
+                        stats["deleted"] += 1
+
+                    stats["processed"] += 1
+
+                except Exception:
+                    pass  # Skip problematic memories
 
         return stats
 
@@ -175,13 +176,11 @@ class EvictionManager:
             content = memory.get("content", "")
 
             # Extract first non-header line
-            lines = content.split("\n")
-            first_line = ""
-            for line in lines:
-                stripped = line.strip()
-                if stripped and not stripped.startswith("## "):
-                    first_line = stripped
-                    break
+            stripped_lines = (line.strip() for line in content.splitlines())
+            first_line = next(
+                (s for s in stripped_lines if s and not s.startswith("## ")),
+                "",
+            )
 
             # Limit to N characters
             max_chars = self.config.abstract_max_chars
@@ -252,7 +251,4 @@ class EvictionManager:
         Returns:
             List of memory IDs that have archives
         """
-        archives = []
-        for path in self.store.archives_path.glob("*.md"):
-            archives.append(path.stem)
-        return archives
+        return list(self.store._list_ids(self.store.archives_path))
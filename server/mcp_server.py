@@ -21,6 +21,8 @@ import asyncio
 import base64
 import json
 import os
+import re
+import signal
 import sys
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
@@ -55,6 +57,9 @@ _token_counter: TokenCounter = TokenCounter(store._read_state().get("config", {}
 # Global shutdown event for server mode
 shutdown_event = asyncio.Event()
 
+# Tool definitions, built lazily by list_tools()
+_tools_cache: list[Tool] | None = None
+
 
 def _get_plugin_info() -> dict:
     """Extract plugin info from environment variables.
@@ -108,6 +113,10 @@ def _get_plugin_info() -> dict:
 # Get plugin info at module load
 PLUGIN_INFO = _get_plugin_info()
 
+# File extensions mentioned in memory text, and those _extract_tags keeps
+_EXTENSION_RE = re.compile(r"\.([a-z]{2,4})\b")
+_TAGGED_EXTENSIONS = frozenset({"py", "js", "ts", "rs", "go", "java", "rb", "php"})
+
 
 def _extract_tags(topic: str, content: str) -> list[str]:
     """
@@ -115,8 +124,6 @@ def _extract_tags(topic: str, content: str) -> list[str]:
 
     Extracts technology names, file extensions, and common patterns.
     """
-    import re
-
     tags = set()
     text = f"{topic} {content}".lower()
 
@@ -140,17 +147,15 @@ def _extract_tags(topic: str, content: str) -> list[str]:
             tags.add(keyword)
 
     # File extensions
-    extensions = re.findall(r"\.([a-z]{2,4})\b", text)
-    for ext in extensions:
-        if ext in ["py", "js", "ts", "rs", "go", "java", "rb", "php"]:
+    for ext in _EXTENSION_RE.findall(text):
+        if ext in _TAGGED_EXTENSIONS:
             tags.add(ext)
 
     return list(tags)[:10]  # Limit to 10 tags
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available LTM tools."""
+def _build_tools() -> list[Tool]:
+    """Build the Tool definitions exposed by the server."""
     return [
         Tool(
             name="store_memory",
@@ -312,6 +317,19 @@ async def list_tools() -> list[Tool]:
     ]
 
 
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available LTM tools.
+
+    The tool set is static, so definitions are built on first call and
+    reused afterwards.
+    """
+    global _tools_cache
+    if _tools_cache is None:
+        _tools_cache = _build_tools()
+    return list(_tools_cache)
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
@@ -384,11 +402,7 @@ async def handle_store_memory(args: dict) -> list[TextContent]:
     )
 
     # Reset counters for next memory segment
-    session["session_tokens"] = 0
-    session["tool_failures"] = 0
-    session["tool_successes"] = 0
-    state["current_session"] = session
-    store._write_state(state)
+    store._update_session(session_tokens=0, tool_failures=0, tool_successes=0)
 
     result = {
         "success": True,
@@ -406,7 +420,8 @@ async def handle_store_memory(args: dict) -> list[TextContent]:
     if tags:
         result["tags"] = tags
 
-    return [TextContent(type="text", text=_format_result(result))]
+    meta = {"id": memory_id, "difficulty": result["difficulty"], "tags": tags}
+    return [TextContent(type="text", text=_format_result(result), _meta=meta)]
 
 
 async def handle_recall(args: dict) -> list[TextContent]:
@@ -494,7 +509,13 @@ async def handle_get_memory(args: dict) -> list[TextContent]:
     output += "---\n\n"
     output += memory.get("content", "")
 
-    return [TextContent(type="text", text=output)]
+    meta = {
+        "id": memory_id,
+        "difficulty": memory.get("difficulty", 0.5),
+        "tags": memory.get("tags", []),
+        "phase": memory.get("phase", 0),
+    }
+    return [TextContent(type="text", text=output, _meta=meta)]
 
 
 async def handle_forget(args: dict) -> list[TextContent]:
@@ -511,7 +532,8 @@ async def handle_forget(args: dict) -> list[TextContent]:
 
     return [TextContent(
         type="text",
-        text=f"Memory {memory_id} has been deleted (archived for recovery)."
+        text=f"Memory {memory_id} has been deleted (archived for recovery).",
+        _meta={"id": memory_id, "archived": True},
     )]
 
 
@@ -528,8 +550,7 @@ async def handle_ltm_status(args: dict) -> list[TextContent]:
             by_phase[phase] += 1
 
     # Count archives
-    archives_path = store.archives_path
-    archive_count = len(list(archives_path.glob("*.md"))) if archives_path.exists() else 0
+    archive_count = len(store._list_ids(store.archives_path))
 
     output = "# LTM System Status\n\n"
 
@@ -726,12 +747,7 @@ async def handle_reset_tokens(args: dict) -> list[TextContent]:
     )
 
     # Reset counters
-    session["session_tokens"] = 0
-    session["tool_failures"] = 0
-    session["tool_successes"] = 0
-
-    state["current_session"] = session
-    store._write_state(state)
+    store._update_session(session_tokens=0, tool_failures=0, tool_successes=0)
 
     # Build output
     before_pct = (before_tokens / normalize_cap) * 100 if normalize_cap > 0 else 0
@@ -989,16 +1005,15 @@ async def hook_session_end(request) -> "web.Response":
     )
 
     # Update priorities for all memories
-    stats = store._read_stats()
-    index = store._read_index()
-
-    for memory_id, mem_stats in stats.get("memories", {}).items():
-        mem_meta = index.get("memories", {}).get(memory_id, {})
-        if not mem_meta:
-            continue
+    ids, difficulty, access_count, last_session = store._priority_columns()
+    priorities = priority_calc.calculate_batch(
+        difficulty, access_count, last_session, current_session_num
+    )
 
-        priority = priority_calc.calculate(mem_meta, mem_stats, current_session_num)
-        mem_stats["priority"] = priority
+    stats = store._read_stats()
+    stats_memories = stats["memories"]
+    for memory_id, priority in zip(ids, priorities):
+        stats_memories[memory_id]["priority"] = priority
 
     store._write_stats(stats)
 
@@ -1259,8 +1274,19 @@ if __name__ == "__main__":  # pragma: no cover
         # Reinitialize global store with new path
         store = MemoryStore(args.data_path)
 
-    if args.server:
-        asyncio.run(run_server_mode(args.mcp_port, args.hooks_port, args.host))
-    else:
-        hooks_port = args.hooks_port if args.with_hooks else None
-        asyncio.run(main_stdio(hooks_port))
+    # Load the tokenizer while the servers start up
+    _token_counter.preload()
+
+    # Exit through the finally block below on SIGTERM too, so buffered
+    # access statistics are not lost when the server is stopped
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+    try:
+        if args.server:
+            asyncio.run(run_server_mode(args.mcp_port, args.hooks_port, args.host))
+        else:
+            hooks_port = args.hooks_port if args.with_hooks else None
+            asyncio.run(main_stdio(hooks_port))
+    finally:
+        # Persist access statistics buffered by store.read()
+        store.flush_stats()
@@ -22,6 +22,10 @@ Without token counting (backward compatible):
 
 from __future__ import annotations
 
+import heapq
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+
 
 class PriorityCalculator:
     """Calculate memory priority scores."""
@@ -31,6 +35,10 @@ class PriorityCalculator:
     RECENCY_WEIGHT = 0.3
     FREQUENCY_WEIGHT = 0.3
 
+    # Difficulty weights: (failure_rate, tool_count, token_usage, compaction)
+    DIFFICULTY_WEIGHTS_WITH_TOKENS = (0.25, 0.15, 0.35, 0.25)
+    DIFFICULTY_WEIGHTS_WITHOUT_TOKENS = (0.5, 0.3, 0.0, 0.2)
+
     # Normalization constants
     FREQUENCY_CAP = 10  # Max accesses for full frequency score
     TOOL_COUNT_CAP = 50  # Max tool invocations for normalization
@@ -69,6 +77,112 @@ class PriorityCalculator:
         # Clamp to [0.0, 1.0]
         return max(0.0, min(1.0, priority))
 
+    def specialize(
+        self, current_session: int
+    ) -> Callable[[dict, dict | None], float]:
+        """
+        Return calculate() bound to a fixed current session.
+
+        For ranking passes that score many memories in the same session.
+        The weights, frequency cap and session are captured once, so each
+        call skips the per-call setup and the score cache. Results match
+        calculate(memory, stats, current_session).
+
+        Args:
+            current_session: Current session number
+
+        Returns:
+            Function taking (memory, stats) and returning the priority
+        """
+        dw, rw, fw = (
+            self.DIFFICULTY_WEIGHT, self.RECENCY_WEIGHT, self.FREQUENCY_WEIGHT
+        )
+        cap = self.FREQUENCY_CAP
+        recency_of = _recency_from_delta
+        frequency_of = _frequency_from_count
+
+        def calculate_for_session(memory: dict, stats: dict | None) -> float:
+            if stats is None:
+                stats = {}
+            recency = recency_of(current_session - stats.get("last_session", 0))
+            frequency = frequency_of(stats.get("access_count", 0), cap)
+            difficulty = memory.get("difficulty", 0.5)
+            priority = difficulty * dw + recency * rw + frequency * fw
+            return max(0.0, min(1.0, priority))
+
+        return calculate_for_session
+
+    def calculate_batch(
+        self,
+        difficulty: Sequence[float],
+        access_count: Sequence[int],
+        last_session: Sequence[int],
+        current_session: int,
+    ) -> list[float]:
+        """
+        Calculate priority scores for many memories at once.
+
+        Takes parallel sequences (one entry per memory) instead of per-memory
+        dicts, so a ranking pass avoids a dict lookup and method call per
+        factor. Results match calculate() element for element.
+
+        Args:
+            difficulty: Difficulty of each memory
+            access_count: Access count of each memory
+            last_session: Session each memory was last accessed in
+            current_session: Current session number
+
+        Returns:
+            Priority scores between 0.0 and 1.0, in input order
+        """
+        cap = self.FREQUENCY_CAP
+        dw, rw, fw = (
+            self.DIFFICULTY_WEIGHT, self.RECENCY_WEIGHT, self.FREQUENCY_WEIGHT
+        )
+        # Bind per-row callables to locals to skip global lookups in the loop
+        recency_of = _recency_from_delta
+        frequency_of = _frequency_from_count
+
+        # Single fused pass: no intermediate recency/frequency lists
+        return [
+            max(0.0, min(1.0, (
+                d * dw
+                + recency_of(current_session - s) * rw
+                + frequency_of(n, cap) * fw
+            )))
+            for d, n, s in zip(difficulty, access_count, last_session)
+        ]
+
+    def rank_top_k(
+        self,
+        difficulty: Sequence[float],
+        access_count: Sequence[int],
+        last_session: Sequence[int],
+        current_session: int,
+        k: int,
+    ) -> list[int]:
+        """
+        Return positions of the k highest-priority memories.
+
+        Scores the batch with calculate_batch() and selects the top k with a
+        heap (O(n log k)) instead of sorting every score. Ties keep input
+        order, matching a stable descending sort.
+
+        Args:
+            difficulty: Difficulty of each memory
+            access_count: Access count of each memory
+            last_session: Session each memory was last accessed in
+            current_session: Current session number
+            k: Number of memories to return
+
+        Returns:
+            Indices into the input sequences, highest priority first
+        """
+        scores = self.calculate_batch(
+            difficulty, access_count, last_session, current_session
+        )
+        return heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+
     def _calculate_recency(self, stats: dict, current_session: int) -> float:
         """
         Calculate recency score based on sessions since last access.
@@ -82,8 +196,7 @@ class PriorityCalculator:
         - 9 sessions ago: 0.1
         """
         last_session = stats.get("last_session", 0)
-        sessions_since = max(0, current_session - last_session)
-        return 1.0 / (1.0 + sessions_since)
+        return _recency_from_delta(current_session - last_session)
 
     def _calculate_frequency(self, stats: dict) -> float:
         """
@@ -92,7 +205,7 @@ class PriorityCalculator:
         Normalized by FREQUENCY_CAP and capped at 1.0.
         """
         access_count = stats.get("access_count", 0)
-        return min(1.0, access_count / self.FREQUENCY_CAP)
+        return _frequency_from_count(access_count, self.FREQUENCY_CAP)
 
     # Default token normalization cap
     DEFAULT_TOKEN_NORMALIZE_CAP = 100000
@@ -125,35 +238,71 @@ class PriorityCalculator:
         Returns:
             Difficulty score between 0.0 and 1.0
         """
-        total = tool_failures + tool_successes
-
-        if total == 0:
-            failure_rate = 0.0
-            tool_count_norm = 0.0
-        else:
-            failure_rate = tool_failures / total
-            tool_count_norm = min(1.0, total / self.TOOL_COUNT_CAP)
-
-        compaction_bonus = 1.0 if compacted else 0.0
-
-        if session_tokens > 0:
-            # New formula with token usage component
-            token_usage_norm = min(1.0, session_tokens / token_normalize_cap)
-            difficulty = (
-                failure_rate * 0.25
-                + tool_count_norm * 0.15
-                + token_usage_norm * 0.35
-                + compaction_bonus * 0.25
-            )
-        else:
-            # Old formula (backward compatible when token counting disabled)
-            difficulty = (
-                failure_rate * 0.5
-                + tool_count_norm * 0.3
-                + compaction_bonus * 0.2
-            )
-
-        return max(0.0, min(1.0, difficulty))
+        return _difficulty_core(
+            tool_failures,
+            tool_successes,
+            compacted,
+            session_tokens,
+            token_normalize_cap,
+            self.TOOL_COUNT_CAP,
+            self.DIFFICULTY_WEIGHTS_WITH_TOKENS,
+            self.DIFFICULTY_WEIGHTS_WITHOUT_TOKENS,
+        )
+
+
+# Recency and frequency depend only on small integers (sessions since last
+# access, access count), so their values are memoized.
+@lru_cache(maxsize=256)
+def _recency_from_delta(sessions_since: int) -> float:
+    """Recency score for a number of sessions since last access."""
+    return 1.0 / (1.0 + max(0, sessions_since))
+
+
+@lru_cache(maxsize=256)
+def _frequency_from_count(access_count: int, cap: int) -> float:
+    """Frequency score for an access count, normalized by cap."""
+    return min(1.0, access_count / cap)
+
+
+def _difficulty_core(
+    tool_failures: int,
+    tool_successes: int,
+    compacted: bool,
+    session_tokens: int,
+    token_normalize_cap: int,
+    tool_count_cap: int,
+    weights_with_tokens: tuple[float, float, float, float],
+    weights_without_tokens: tuple[float, float, float, float],
+) -> float:
+    """
+    Arithmetic core of PriorityCalculator.calculate_difficulty.
+
+    Both formulas share one weighted sum; the formula is chosen by picking
+    a weight tuple. The old formula has a zero token weight, so it gives
+    the same result as before.
+    """
+    total = tool_failures + tool_successes
+
+    # With no tool calls both terms are 0.0 without a special case
+    failure_rate = tool_failures / max(1, total)
+    tool_count_norm = min(1.0, total / tool_count_cap)
+
+    if session_tokens > 0:
+        weights = weights_with_tokens
+        token_usage_norm = min(1.0, session_tokens / token_normalize_cap)
+    else:
+        # Old formula (backward compatible when token counting disabled)
+        weights = weights_without_tokens
+        token_usage_norm = 0.0
+
+    difficulty = (
+        failure_rate * weights[0]
+        + tool_count_norm * weights[1]
+        + token_usage_norm * weights[2]
+        + (1.0 if compacted else 0.0) * weights[3]
+    )
+
+    return max(0.0, min(1.0, difficulty))
 
 
 # Module-level instance for convenience
@@ -13,18 +13,71 @@ Memory files are stored in memories/ as {id}.md with YAML frontmatter.
 
 from __future__ import annotations
 
-import hashlib
+import heapq
 import json
 import os
+import random
 import re
+import shutil
 import tempfile
-import uuid
+import time
+import weakref
+from collections.abc import Container, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from priority import PriorityCalculator
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# json.dumps() builds a new encoder per call for non-default options
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to 2-space indented UTF-8 JSON with a trailing newline.
+
+    orjson and the stdlib fallback produce the same layout, so git-tracked
+    files such as index.json do not churn when the backend changes.
+    """
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        )
+    return (_JSON_ENCODER.encode(data) + "\n").encode("utf-8")
+
+
+# Source of memory IDs; a private generator is unaffected by random.seed()
+_id_random = random.Random()
+
+# Frontmatter block between --- markers, followed by the markdown body
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)$", re.DOTALL)
+
+# Frontmatter fields written to memory files, in file order
+_FRONTMATTER_FIELDS = (
+    "id",
+    "topic",
+    "tags",
+    "phase",
+    "difficulty",
+    "created_at",
+    "created_session",
+)
+
 
 class MemoryNotFoundError(Exception):
     """Raised when a memory ID is not found."""
@@ -35,13 +88,34 @@ class MemoryNotFoundError(Exception):
 class MemoryStore:
     """Core storage operations for memories."""
 
-    def __init__(self, base_path: str | Path | None = None):
+    # Directory listings younger than this are not cached (mtime granularity)
+    DIR_CACHE_MIN_AGE_NS = 1_000_000_000
+
+    # Max parsed memory files kept by _parse_memory_file
+    PARSE_CACHE_SIZE = 1024
+
+    # Buffered read() stats updates written per stats.json write
+    STATS_FLUSH_INTERVAL = 16
+
+    # Files removed by one _unlink_files call before it uses worker threads
+    PARALLEL_UNLINK_MIN = 64
+
+    # Instances handed out by open(), keyed by resolved base path; held
+    # weakly, so a store is dropped once no caller references it
+    _instances: weakref.WeakValueDictionary[str, MemoryStore] = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __init__(self, base_path: str | Path | None = None, durable: bool = True):
         """
         Initialize the memory store.
 
         Args:
             base_path: Path to .claude/ltm directory. Defaults to LTM_DATA_PATH
                        environment variable, or .claude/ltm relative to cwd.
+            durable: Write files via temp file + rename so readers never see
+                     a partial file. Pass False for throwaway stores (tests)
+                     to write files in place.
         """
         if base_path is None:
             # Check for container environment variable first
@@ -58,6 +132,8 @@ class MemoryStore:
         self.stats_path = self.base_path / "stats.json"
         self.state_path = self.base_path / "state.json"
 
+        self._durable = durable
+
         # Ensure directories exist
         self.memories_path.mkdir(parents=True, exist_ok=True)
         self.archives_path.mkdir(parents=True, exist_ok=True)
@@ -70,6 +146,61 @@ class MemoryStore:
         self._stats_cache: dict | None = None
         self._state_cache: dict | None = None
 
+        # read() updates held in _stats_cache but not yet in stats.json
+        self._stats_pending = 0
+
+        # Open batch() blocks, and index/stats writes they have deferred
+        self._batch_depth = 0
+        self._index_dirty = False
+        self._stats_dirty = False
+
+        # Scoring columns derived from index + stats (see _priority_columns)
+        self._columns_cache: tuple[list, list, list, list] | None = None
+
+        # Priority ranking for list(): (session, ranked IDs, priority by ID)
+        self._ranked_cache: tuple[int, list[str], dict[str, float]] | None = None
+
+        # Memory IDs grouped by eviction phase (see _ids_by_phase)
+        self._phase_cache: dict[int, list[str]] | None = None
+
+        # Case-folded topic per memory ID (see _folded_topics)
+        self._folded_cache: dict[str, str] | None = None
+
+        # Memory IDs per tag, exact and case-folded (see _tag_postings)
+        self._tag_cache: tuple[dict[str, list[str]], dict[str, set[str]]] | None = None
+
+        # Directory listings keyed by path: (dir mtime_ns, memory IDs)
+        self._dir_cache: dict[str, tuple[int, frozenset[str]]] = {}
+
+        # Parsed memory files keyed by path: ((ino, mtime_ns, size), data)
+        self._parse_cache: dict[str, tuple[tuple[int, int, int], dict]] = {}
+
+    @classmethod
+    def open(cls, base_path: str | Path) -> MemoryStore:
+        """
+        Return a shared store for base_path, constructing it on first use.
+
+        Instances are memoized by resolved path while anything references
+        them. A cached instance is rebuilt if its directories have been
+        removed; otherwise it is returned as is, so call invalidate_cache()
+        after changing its files on disk.
+
+        Args:
+            base_path: Path to .claude/ltm directory
+
+        Returns:
+            MemoryStore for base_path
+        """
+        key = str(Path(base_path).resolve())
+        instance = cls._instances.get(key)
+        if (
+            instance is None
+            or not instance.memories_path.is_dir()
+            or not instance.archives_path.is_dir()
+        ):
+            instance = cls._instances[key] = cls(base_path)
+        return instance
+
     # =========================================================================
     # CRUD Operations
     # =========================================================================
@@ -93,7 +224,59 @@ class MemoryStore:
         Returns:
             Generated memory ID (mem_<hash>)
         """
-        memory_id = self._generate_id()
+        index = self._read_index()
+        stats = self._read_stats()
+
+        memory_id = self._create_entry(
+            index, stats, topic, content, tags=tags, difficulty=difficulty
+        )
+
+        self._write_index(index)
+        self._write_stats(stats)
+
+        return memory_id
+
+    def create_many(self, specs: list[dict]) -> list[str]:
+        """
+        Create several memories with a single index and stats write.
+
+        Args:
+            specs: One dict per memory with create() keyword arguments
+                   ('topic' and 'content' required; 'tags', 'difficulty')
+
+        Returns:
+            Generated memory IDs, in the order of specs
+        """
+        index = self._read_index()
+        stats = self._read_stats()
+
+        memory_ids = [self._create_entry(index, stats, **spec) for spec in specs]
+
+        if memory_ids:
+            self._write_index(index)
+            self._write_stats(stats)
+
+        return memory_ids
+
+    def _create_entry(
+        self,
+        index: dict,
+        stats: dict,
+        topic: str,
+        content: str,
+        tags: list[str] | None = None,
+        difficulty: float = 0.5,
+    ) -> str:
+        """
+        Write a new memory file and add its index and stats entries.
+
+        The index and stats dicts are updated in memory only; the caller
+        writes them.
+
+        Returns:
+            Generated memory ID (mem_<hash>)
+        """
+        memory_id = self._generate_id(index["memories"])
         now = datetime.now(timezone.utc).isoformat()
 
         # Get current session number
@@ -116,7 +299,6 @@ class MemoryStore:
         self._write_memory_file(memory_id, memory_data)
 
         # Update index
-        index = self._read_index()
         index["memories"][memory_id] = {
             "topic": topic,
             "tags": tags or [],
@@ -124,10 +306,8 @@ class MemoryStore:
             "difficulty": memory_data["difficulty"],
             "created_at": now,
         }
-        self._write_index(index)
 
         # Initialize stats
-        stats = self._read_stats()
         stats["memories"][memory_id] = {
             "access_count": 0,
             "accessed_at": now,
@@ -138,7 +318,6 @@ class MemoryStore:
                 current_session,
             ),
         }
-        self._write_stats(stats)
 
         return memory_id
 
@@ -180,7 +359,13 @@ class MemoryStore:
             )
 
             stats["memories"][memory_id] = mem_stats
-            self._write_stats(stats)
+            self._columns_cache = None
+            self._ranked_cache = None
+
+            # Access counts are volatile; coalesce their writes
+            self._stats_pending += 1
+            if self._stats_pending >= self.STATS_FLUSH_INTERVAL:
+                self._write_stats(stats)
 
         return memory_data
 
@@ -247,18 +432,15 @@ class MemoryStore:
         if not memory_path.exists():
             raise MemoryNotFoundError(f"Memory not found: {memory_id}")
 
-        # Archive if requested and not already archived
-        if archive:
-            archive_path = self.archives_path / f"{memory_id}.md"
-            if not archive_path.exists():
-                # Copy to archive
-                memory_data = self._parse_memory_file(memory_path)
-                self._write_memory_file(
-                    memory_id, memory_data, path=archive_path
-                )
-
-        # Remove memory file
-        memory_path.unlink()
+        # Move to archive if requested and not already archived; otherwise
+        # remove the memory file
+        archive_path = self.archives_path / f"{memory_id}.md"
+        if archive and not archive_path.exists():
+            # Same filesystem in practice, so this is a rename, not a copy
+            shutil.move(memory_path, archive_path)
+        else:
+            memory_path.unlink()
+        self._parse_cache.pop(str(memory_path), None)
 
         # Remove from index
         index = self._read_index()
@@ -295,36 +477,55 @@ class MemoryStore:
         Returns:
             List of memory metadata dicts, sorted by priority (highest first)
         """
+        # Publish buffered access counts before other processes rank by them
+        self.flush_stats()
         index = self._read_index()
         stats = self._read_stats()
         state = self._read_state()
-        current_session = state.get("session_count", 1)
+        ranked_ids, priorities = self._ranked_ids(state.get("session_count", 1))
+        memories = index["memories"]
 
-        results = []
+        if phase is None and tag is None and keyword is None:
+            # Unfiltered: the page is a slice of the cached ranking
+            page = ranked_ids[offset:offset + limit]
+        else:
+            if keyword is not None:
+                needle = keyword.casefold()
+                folded = self._folded_topics()
+
+            # Only visit memories carrying the tag or in the phase, if given
+            if tag is not None:
+                candidate_ids = self._tag_postings()[0].get(tag, [])
+            elif phase is not None:
+                candidate_ids = self._ids_by_phase().get(phase, [])
+            else:
+                candidate_ids = memories.keys()
+
+            matches = []
+            for memory_id in candidate_ids:
+                # Apply phase filter
+                if (
+                    phase is not None
+                    and memories[memory_id].get("phase", 0) != phase
+                ):
+                    continue
 
-        for memory_id, memory_meta in index["memories"].items():
-            # Apply phase filter
-            if phase is not None and memory_meta.get("phase", 0) != phase:
-                continue
+                # Apply keyword filter (case-insensitive)
+                if keyword is not None and needle not in folded[memory_id]:
+                    continue
 
-            # Apply tag filter
-            if tag is not None and tag not in memory_meta.get("tags", []):
-                continue
+                matches.append(memory_id)
 
-            # Apply keyword filter (case-insensitive)
-            if keyword is not None:
-                topic = memory_meta.get("topic", "").lower()
-                if keyword.lower() not in topic:
-                    continue
+            # Select the requested page by priority (highest first); only the
+            # first offset + limit matches need to be ordered
+            page = heapq.nlargest(
+                offset + limit, matches, key=priorities.__getitem__
+            )[offset:]
 
-            # Get or calculate priority
+        results = []
+        for memory_id in page:
+            memory_meta = memories[memory_id]
             mem_stats = stats["memories"].get(memory_id, {})
-            priority = mem_stats.get("priority")
-            if priority is None:
-                priority = self._priority_calc.calculate(
-                    memory_meta, mem_stats, current_session
-                )
-
             results.append(
                 {
                     "id": memory_id,
@@ -332,18 +533,13 @@ class MemoryStore:
                     "tags": memory_meta.get("tags", []),
                     "phase": memory_meta.get("phase", 0),
                     "difficulty": memory_meta.get("difficulty", 0.5),
-                    "priority": priority,
+                    "priority": priorities[memory_id],
                     "created_at": memory_meta.get("created_at", ""),
                     "access_count": mem_stats.get("access_count", 0),
                     "accessed_at": mem_stats.get("accessed_at", ""),
                 }
             )
-
-        # Sort by priority (highest first)
-        results.sort(key=lambda x: x.get("priority", 0), reverse=True)
-
-        # Apply pagination
-        return results[offset : offset + limit]
+        return results
 
     def search(self, query: str, limit: int = 10) -> list[dict]:
         """
@@ -356,76 +552,67 @@ class MemoryStore:
         Returns:
             List of matching memories, sorted by priority
         """
+        self.flush_stats()
         index = self._read_index()
-        stats = self._read_stats()
         state = self._read_state()
-        current_session = state.get("session_count", 1)
+        _, priorities = self._ranked_ids(state.get("session_count", 1))
+
+        needle = query.casefold()
+        folded = self._folded_topics()
+
+        # Memories with a tag containing the query, checked per unique tag
+        tagged_ids: set[str] = set()
+        for folded_tag, ids in self._tag_postings()[1].items():
+            if needle in folded_tag:
+                tagged_ids |= ids
+
+        # Match on topic or tags first; content is only read when neither hits
+        matches = [
+            memory_id
+            for memory_id in index["memories"]
+            if needle in folded[memory_id]
+            or memory_id in tagged_ids
+            or needle in self._memory_content(memory_id).casefold()
+        ]
 
-        query_lower = query.lower()
+        # Select the top matches by priority (highest first); summaries are
+        # only needed for those
         results = []
+        for memory_id in heapq.nlargest(limit, matches, key=priorities.__getitem__):
+            memory_meta = index["memories"][memory_id]
 
-        for memory_id, memory_meta in index["memories"].items():
-            # Check topic
-            topic_match = query_lower in memory_meta.get("topic", "").lower()
+            # Get summary (first 200 chars of content)
+            content = self._memory_content(memory_id)
+            summary = content[:200] + "..." if len(content) > 200 else content
 
-            # Check tags
-            tag_match = any(
-                query_lower in tag.lower()
-                for tag in memory_meta.get("tags", [])
+            results.append(
+                {
+                    "id": memory_id,
+                    "topic": memory_meta.get("topic", ""),
+                    "summary": summary,
+                    "tags": memory_meta.get("tags", []),
+                    "phase": memory_meta.get("phase", 0),
+                    "priority": priorities[memory_id],
+                }
             )
 
-            # Check content (need to read file)
-            content_match = False
-            if not topic_match and not tag_match:
-                memory_path = self.memories_path / f"{memory_id}.md"
-                if memory_path.exists():
-                    memory_data = self._parse_memory_file(memory_path)
-                    content_match = query_lower in memory_data.get(
-                        "content", ""
-                    ).lower()
-
-            if topic_match or tag_match or content_match:
-                mem_stats = stats["memories"].get(memory_id, {})
-                priority = mem_stats.get("priority")
-                if priority is None:
-                    priority = self._priority_calc.calculate(
-                        memory_meta, mem_stats, current_session
-                    )
-
-                # Get summary (first 200 chars of content)
-                memory_path = self.memories_path / f"{memory_id}.md"
-                if memory_path.exists():
-                    memory_data = self._parse_memory_file(memory_path)
-                    content = memory_data.get("content", "")
-                    summary = content[:200] + "..." if len(content) > 200 else content
-                else:
-                    summary = ""
-
-                results.append(
-                    {
-                        "id": memory_id,
-                        "topic": memory_meta.get("topic", ""),
-                        "summary": summary,
-                        "tags": memory_meta.get("tags", []),
-                        "phase": memory_meta.get("phase", 0),
-                        "priority": priority,
-                    }
-                )
-
-        # Sort by priority (highest first)
-        results.sort(key=lambda x: x.get("priority", 0), reverse=True)
-
-        return results[:limit]
+        return results
 
     # =========================================================================
     # Internal Helpers
     # =========================================================================
 
-    def _generate_id(self) -> str:
-        """Generate unique memory ID (mem_<8-char-hash>)."""
-        unique = f"{uuid.uuid4()}{datetime.now().isoformat()}"
-        hash_val = hashlib.sha256(unique.encode()).hexdigest()[:8]
-        return f"mem_{hash_val}"
+    def _generate_id(self, existing: Container[str] = ()) -> str:
+        """
+        Generate unique memory ID (mem_<8 hex chars>).
+
+        IDs only need to be unique within the store, so they come from a
+        non-cryptographic generator; one already in existing is redrawn.
+        """
+        while True:
+            memory_id = f"mem_{_id_random.getrandbits(32):08x}"
+            if memory_id not in existing:
+                return memory_id
 
     def _read_index(self) -> dict:
         """Load index.json, creating if missing."""
@@ -433,8 +620,7 @@ class MemoryStore:
             return self._index_cache
 
         if self.index_path.exists():
-            with open(self.index_path, "r", encoding="utf-8") as f:
-                self._index_cache = json.load(f)
+            self._index_cache = _json_loads(self.index_path.read_bytes())
         else:
             self._index_cache = {
                 "version": 1,
@@ -444,9 +630,17 @@ class MemoryStore:
         return self._index_cache
 
     def _write_index(self, data: dict) -> None:
-        """Atomic write to index.json."""
-        self._atomic_write_json(self.index_path, data)
+        """Atomic write to index.json, deferred to the end of a batch()."""
+        if self._batch_depth:
+            self._index_dirty = True
+        else:
+            self._atomic_write_json(self.index_path, data)
         self._index_cache = data
+        self._columns_cache = None
+        self._ranked_cache = None
+        self._phase_cache = None
+        self._folded_cache = None
+        self._tag_cache = None
 
     def _read_stats(self) -> dict:
         """Load stats.json, creating if missing."""
@@ -454,8 +648,7 @@ class MemoryStore:
             return self._stats_cache
 
         if self.stats_path.exists():
-            with open(self.stats_path, "r", encoding="utf-8") as f:
-                self._stats_cache = json.load(f)
+            self._stats_cache = _json_loads(self.stats_path.read_bytes())
         else:
             self._stats_cache = {
                 "version": 1,
@@ -465,9 +658,157 @@ class MemoryStore:
         return self._stats_cache
 
     def _write_stats(self, data: dict) -> None:
-        """Atomic write to stats.json."""
-        self._atomic_write_json(self.stats_path, data)
+        """Atomic write to stats.json, deferred to the end of a batch()."""
+        if self._batch_depth:
+            self._stats_dirty = True
+        else:
+            self._atomic_write_json(self.stats_path, data)
+            self._stats_pending = 0
         self._stats_cache = data
+        self._columns_cache = None
+        self._ranked_cache = None
+
+    def flush_stats(self) -> None:
+        """Write access statistics buffered by read() to stats.json."""
+        if self._stats_pending:
+            self._write_stats(self._stats_cache)
+
+    @contextmanager
+    def batch(self) -> Iterator[MemoryStore]:
+        """
+        Coalesce index.json and stats.json writes made inside the block.
+
+        Operations update the cached index and stats as usual, but each
+        file is written at most once, when the outermost batch exits (also
+        on error, since memory files may already have changed). Blocks nest.
+
+        Example:
+            with store.batch():
+                for memory_id in ids:
+                    store.update(memory_id, phase=1)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Write index and stats changes deferred by batch()."""
+        if self._index_dirty:
+            self._index_dirty = False
+            self._atomic_write_json(self.index_path, self._index_cache)
+        if self._stats_dirty:
+            self._stats_dirty = False
+            self._atomic_write_json(self.stats_path, self._stats_cache)
+            self._stats_pending = 0
+
+    def _priority_columns(self) -> tuple[list[str], list[float], list[int], list[int]]:
+        """
+        Column view of the scoring fields of indexed memories.
+
+        Returns parallel lists (ids, difficulty, access_count, last_session)
+        for memories with both an index and a stats entry, in the shape
+        PriorityCalculator.calculate_batch expects. The lists are cached
+        until index or stats are written and must not be mutated.
+        """
+        if self._columns_cache is None:
+            stats_memories = self._read_stats().get("memories", {})
+            ids: list[str] = []
+            difficulty: list[float] = []
+            access_count: list[int] = []
+            last_session: list[int] = []
+
+            for memory_id, meta in self._read_index().get("memories", {}).items():
+                mem_stats = stats_memories.get(memory_id)
+                if not meta or mem_stats is None:
+                    continue
+                ids.append(memory_id)
+                difficulty.append(meta.get("difficulty", 0.5))
+                access_count.append(mem_stats.get("access_count", 0))
+                last_session.append(mem_stats.get("last_session", 0))
+
+            self._columns_cache = (ids, difficulty, access_count, last_session)
+
+        return self._columns_cache
+
+    def _ranked_ids(self, current_session: int) -> tuple[list[str], dict[str, float]]:
+        """
+        Indexed memory IDs ranked by priority, highest first.
+
+        Uses the stored priority when stats have one and calculates it
+        otherwise. Ties keep index order. Returns (ranked IDs, priority by
+        ID), cached for current_session until index or stats change; the
+        results must not be mutated.
+        """
+        cached = self._ranked_cache
+        if cached is not None and cached[0] == current_session:
+            return cached[1], cached[2]
+
+        score = self._priority_calc.specialize(current_session)
+        stats_memories = self._read_stats().get("memories", {})
+        priorities: dict[str, float] = {}
+        for memory_id, meta in self._read_index().get("memories", {}).items():
+            mem_stats = stats_memories.get(memory_id, {})
+            priority = mem_stats.get("priority")
+            if priority is None:
+                priority = score(meta, mem_stats)
+            priorities[memory_id] = priority
+
+        ranked = sorted(priorities, key=priorities.__getitem__, reverse=True)
+        self._ranked_cache = (current_session, ranked, priorities)
+        return ranked, priorities
+
+    def _ids_by_phase(self) -> dict[int, list[str]]:
+        """
+        Indexed memory IDs grouped by eviction phase, in index order.
+
+        Lets a phase-filtered list() visit only matching memories. Cached
+        until the index is written and must not be mutated.
+        """
+        if self._phase_cache is None:
+            by_phase: dict[int, list[str]] = {}
+            for memory_id, meta in self._read_index().get("memories", {}).items():
+                by_phase.setdefault(meta.get("phase", 0), []).append(memory_id)
+            self._phase_cache = by_phase
+        return self._phase_cache
+
+    def _tag_postings(self) -> tuple[dict[str, list[str]], dict[str, set[str]]]:
+        """
+        Memory IDs per tag, for tag filters that skip untagged memories.
+
+        Returns (exact, folded): IDs keyed by tag in index order, and ID
+        sets keyed by case-folded tag. Cached until the index is written
+        and must not be mutated.
+        """
+        if self._tag_cache is None:
+            exact: dict[str, list[str]] = {}
+            folded: dict[str, set[str]] = {}
+            for memory_id, meta in self._read_index().get("memories", {}).items():
+                for tag in meta.get("tags", []):
+                    ids = exact.setdefault(tag, [])
+                    if not ids or ids[-1] != memory_id:
+                        ids.append(memory_id)
+                    folded.setdefault(tag.casefold(), set()).add(memory_id)
+            self._tag_cache = (exact, folded)
+        return self._tag_cache
+
+    def _folded_topics(self) -> dict[str, str]:
+        """
+        Case-folded topic of each indexed memory, keyed by ID.
+
+        Used for case-insensitive keyword matching so each query folds only
+        the needle. Cached until the index is written and must not be mutated.
+        """
+        if self._folded_cache is None:
+            memories = self._read_index().get("memories", {})
+            self._folded_cache = {
+                memory_id: meta.get("topic", "").casefold()
+                for memory_id, meta in memories.items()
+            }
+        return self._folded_cache
 
     def _read_state(self) -> dict:
         """Load state.json, creating if missing."""
@@ -494,8 +835,7 @@ class MemoryStore:
         }
 
         if self.state_path.exists():
-            with open(self.state_path, "r", encoding="utf-8") as f:
-                self._state_cache = json.load(f)
+            self._state_cache = _json_loads(self.state_path.read_bytes())
 
             # Merge defaults for missing fields
             if "current_session" not in self._state_cache:
@@ -519,30 +859,124 @@ class MemoryStore:
         self._atomic_write_json(self.state_path, data)
         self._state_cache = data
 
+    def _update_session(self, **fields) -> dict:
+        """Update current_session fields in the cached state and write once.
+
+        Returns:
+            The updated state dict
+        """
+        state = self._read_state()
+        state.setdefault("current_session", {}).update(fields)
+        self._write_state(state)
+        return state
+
     def _atomic_write_json(self, path: Path, data: dict) -> None:
-        """Write JSON atomically using temp file + rename."""
+        """
+        Write JSON atomically using temp file + rename.
+
+        The temp file is not fsynced: the rename guarantees readers see the
+        old or the new file, never a partial one, but after a power loss the
+        most recent write may be lost. index.json is tracked in git and
+        stats/state are volatile, so the page cache is trusted rather than
+        forcing a flush on every write.
+        """
+        if not self._durable:
+            self._raw_write(path, _json_dumps(data))
+            return
+
         dir_path = path.parent
         fd, temp_path = tempfile.mkstemp(dir=dir_path, suffix=".json")
 
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                f.write("\n")
+            self._write_fd(fd, _json_dumps(data))
 
-            os.rename(temp_path, path)
+            os.replace(temp_path, path)
         except Exception:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
             raise
 
+    @staticmethod
+    def _write_fd(fd: int, data: bytes) -> None:
+        """Write all of data to a file descriptor, then close it."""
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    @classmethod
+    def _raw_write(cls, path: Path, data: bytes) -> None:
+        """
+        Write bytes to a file in place.
+
+        Memory and data files are small, so unbuffered os.write calls are
+        cheaper than setting up a Python file object.
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        cls._write_fd(fd, data)
+
+    @staticmethod
+    def _raw_read(path: Path) -> bytes:
+        """Read a whole (small) file with unbuffered os.read calls."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            chunks = []
+            while chunk := os.read(fd, 65536):
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        return b"".join(chunks)
+
+    def _memory_content(self, memory_id: str) -> str:
+        """Return a memory's markdown body, or "" if its file is missing."""
+        try:
+            memory_data = self._parse_memory_file(
+                self.memories_path / f"{memory_id}.md"
+            )
+        except FileNotFoundError:
+            return ""
+        return memory_data.get("content", "")
+
     def _parse_memory_file(self, path: Path) -> dict:
-        """Parse markdown file with YAML frontmatter."""
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+        """
+        Parse markdown file with YAML frontmatter.
+
+        Results are cached until the file's inode, mtime or size changes.
+        Callers get a copy and may modify it freely.
+        """
+        st = path.stat()
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        key = str(path)
+
+        cached = self._parse_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return self._copy_parsed(cached[1])
+
+        text = self._raw_read(path).decode("utf-8")
+        if "\r" in text:
+            # Universal newlines, as read_text() would give for CRLF checkouts
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        data = self._parse_memory_text(text)
+
+        if len(self._parse_cache) >= self.PARSE_CACHE_SIZE:
+            self._parse_cache.clear()
+        self._parse_cache[key] = (signature, data)
+        return self._copy_parsed(data)
+
+    @staticmethod
+    def _copy_parsed(data: dict) -> dict:
+        """Copy parsed memory data, including its list values."""
+        return {
+            key: value.copy() if isinstance(value, list) else value
+            for key, value in data.items()
+        }
 
-        # Parse YAML frontmatter
-        frontmatter_pattern = r"^---\s*\n(.*?)\n---\s*\n(.*)$"
-        match = re.match(frontmatter_pattern, content, re.DOTALL)
+    def _parse_memory_text(self, content: str) -> dict:
+        """Parse the text of a markdown file with YAML frontmatter."""
+        # Parse YAML frontmatter; files without the opening marker skip the regex
+        match = content.startswith("---") and _FRONTMATTER_RE.match(content)
 
         if not match:
             # No frontmatter, treat entire file as content
@@ -618,7 +1052,12 @@ class MemoryStore:
         data: dict,
         path: Path | None = None,
     ) -> None:
-        """Write memory as markdown with YAML frontmatter."""
+        """
+        Write memory as markdown with YAML frontmatter.
+
+        Uses the same temp file + rename as _atomic_write_json, also
+        without fsync.
+        """
         if path is None:
             path = self.memories_path / f"{memory_id}.md"
 
@@ -626,17 +1065,7 @@ class MemoryStore:
         frontmatter_lines = ["---"]
 
         # Add fields in specific order
-        field_order = [
-            "id",
-            "topic",
-            "tags",
-            "phase",
-            "difficulty",
-            "created_at",
-            "created_session",
-        ]
-
-        for field in field_order:
+        for field in _FRONTMATTER_FIELDS:
             if field in data:
                 value = data[field]
                 if isinstance(value, list):
@@ -656,25 +1085,119 @@ class MemoryStore:
 
         full_content = "\n".join(frontmatter_lines) + content + "\n"
 
+        self._parse_cache.pop(str(path), None)
+
+        encoded = full_content.encode("utf-8")
+        if not self._durable:
+            self._raw_write(path, encoded)
+            return
+
         # Atomic write
         dir_path = path.parent
         fd, temp_path = tempfile.mkstemp(dir=dir_path, suffix=".md")
 
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(full_content)
+            self._write_fd(fd, encoded)
 
-            os.rename(temp_path, path)
+            os.replace(temp_path, path)
         except Exception:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
             raise
 
-    def invalidate_cache(self) -> None:
-        """Clear all cached data."""
-        self._index_cache = None
-        self._stats_cache = None
-        self._state_cache = None
+    def reset(self) -> None:
+        """Remove all memories, archives and data files, leaving an empty store.
+
+        The store behaves as if freshly constructed on an empty directory,
+        which lets callers reuse one instance instead of rebuilding it.
+        """
+        self._stats_pending = 0
+        self._index_dirty = self._stats_dirty = False
+        for dir_path in (self.memories_path, self.archives_path):
+            shutil.rmtree(dir_path, ignore_errors=True)
+            dir_path.mkdir(parents=True, exist_ok=True)
+        for path in (self.index_path, self.stats_path, self.state_path):
+            path.unlink(missing_ok=True)
+        self.invalidate_cache()
+
+    def invalidate_cache(self, kind: str | None = None) -> None:
+        """
+        Clear cached data so it is re-read from disk.
+
+        Args:
+            kind: "index", "stats" or "state" to clear only that data file
+                  and the caches derived from it, "files" to clear only the
+                  directory listings and parsed memory files; None clears
+                  everything. Buffered stats and writes deferred by batch()
+                  are written before index or stats are cleared.
+
+        Raises:
+            ValueError: If kind is not a known cache
+        """
+        if kind not in (None, "index", "stats", "state", "files"):
+            raise ValueError(f"Unknown cache kind: {kind}")
+
+        if kind in (None, "stats"):
+            self.flush_stats()
+        if kind in (None, "index", "stats"):
+            self._flush_batch()
+
+        if kind in (None, "index"):
+            self._index_cache = None
+            self._columns_cache = None
+            self._ranked_cache = None
+            self._phase_cache = None
+            self._folded_cache = None
+            self._tag_cache = None
+        if kind in (None, "stats"):
+            self._stats_cache = None
+            self._columns_cache = None
+            self._ranked_cache = None
+        if kind in (None, "state"):
+            self._state_cache = None
+        if kind in (None, "files"):
+            self._dir_cache.clear()
+            self._parse_cache.clear()
+
+    def _list_ids(self, dir_path: Path) -> frozenset[str]:
+        """
+        List memory IDs (file stems of *.md files) in a directory.
+
+        Entries are filtered by name and the file type reported by
+        os.scandir, so no per-file stat is needed (except for symlinks).
+
+        Listings are cached and reused while the directory mtime is
+        unchanged. A listing taken too soon after the last modification is
+        not cached, since a further change could land in the same mtime tick.
+        invalidate_cache("files") drops all cached listings.
+
+        Args:
+            dir_path: Directory to scan (memories or archives)
+
+        Returns:
+            Frozen set of memory IDs, empty if the directory does not exist
+        """
+        key = str(dir_path)
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except FileNotFoundError:
+            self._dir_cache.pop(key, None)
+            return frozenset()
+
+        cached = self._dir_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with os.scandir(dir_path) as entries:
+            ids = frozenset(
+                entry.name[:-3]
+                for entry in entries
+                if entry.name.endswith(".md") and entry.is_file()
+            )
+
+        if time.time_ns() - mtime_ns > self.DIR_CACHE_MIN_AGE_NS:
+            self._dir_cache[key] = (mtime_ns, ids)
+        return ids
 
     def check_integrity(self) -> dict:
         """
@@ -688,39 +1211,41 @@ class MemoryStore:
             - orphaned_archives: archive files for non-existent memories
             - is_healthy: True if no issues found
         """
+        return self._scan_integrity()[0]
+
+    def _scan_integrity(self) -> tuple[dict, dict, dict]:
+        """
+        Build the check_integrity() report.
+
+        Returns:
+            (report, index, stats), the index and stats being the loaded
+            data the report was computed from, for fix_integrity to mutate
+        """
         index = self._read_index()
         stats = self._read_stats()
 
-        indexed_ids = set(index.get("memories", {}).keys())
-        stats_ids = set(stats.get("memories", {}).keys())
-
-        # Find memory files on disk
-        file_ids = set()
-        for path in self.memories_path.glob("*.md"):
-            file_ids.add(path.stem)
+        # Key views support set operations without copying the IDs
+        indexed_ids = index.get("memories", {}).keys()
+        stats_ids = stats.get("memories", {}).keys()
 
-        # Find archive files on disk
-        archive_ids = set()
-        for path in self.archives_path.glob("*.md"):
-            archive_ids.add(path.stem)
+        # Find memory and archive files on disk; IDs come from file names,
+        # so no memory file is opened or parsed
+        file_ids = self._list_ids(self.memories_path)
+        archive_ids = self._list_ids(self.archives_path)
 
-        # Detect issues
-        orphaned_files = list(file_ids - indexed_ids)
-        missing_files = list(indexed_ids - file_ids)
-        orphaned_stats = list(stats_ids - indexed_ids)
+        # Detect issues; sorted so reports are stable between runs
+        orphaned_files = sorted(file_ids - indexed_ids)
+        missing_files = sorted(indexed_ids - file_ids)
+        orphaned_stats = sorted(stats_ids - indexed_ids)
         # Archives for memories that no longer exist (not in index and not in files)
-        orphaned_archives = list(archive_ids - indexed_ids - file_ids)
+        orphaned_archives = sorted(archive_ids - indexed_ids - file_ids)
 
-        return {
+        report = {
             "orphaned_files": orphaned_files,
             "missing_files": missing_files,
             "orphaned_stats": orphaned_stats,
             "orphaned_archives": orphaned_archives,
-            "is_healthy": (
-                len(orphaned_files) == 0
-                and len(missing_files) == 0
-                and len(orphaned_stats) == 0
-            ),
+            "is_healthy": not (orphaned_files or missing_files or orphaned_stats),
             "summary": {
                 "indexed": len(indexed_ids),
                 "files": len(file_ids),
@@ -728,6 +1253,7 @@ class MemoryStore:
                 "archives": len(archive_ids),
             },
         }
+        return report, index, stats
 
     def fix_integrity(
         self, archive_orphans: bool = True, clean_orphaned_archives: bool = False
@@ -747,7 +1273,7 @@ class MemoryStore:
             - removed_stats_entries: orphaned stats entries that were removed
             - removed_orphaned_archives: orphaned archive files that were removed
         """
-        issues = self.check_integrity()
+        issues, index, stats = self._scan_integrity()
 
         result = {
             "archived_files": 0,
@@ -757,34 +1283,34 @@ class MemoryStore:
             "removed_orphaned_archives": 0,
         }
 
-        index = self._read_index()
-        stats = self._read_stats()
         index_modified = False
         stats_modified = False
 
         # Handle orphaned memory files (files with no index entry)
-        for memory_id in issues["orphaned_files"]:
-            memory_path = self.memories_path / f"{memory_id}.md"
+        orphan_paths = [
+            self.memories_path / f"{memory_id}.md"
+            for memory_id in issues["orphaned_files"]
+        ]
+        for memory_path in orphan_paths:
+            memory_id = memory_path.stem
 
             if archive_orphans:
                 # Archive the file before removal
                 archive_path = self.archives_path / f"{memory_id}.md"
                 if not archive_path.exists() and memory_path.exists():
                     try:
-                        import shutil
-
-                        shutil.copy2(memory_path, archive_path)
+                        # Hard link (no data copied) unless the link fails,
+                        # e.g. archives on another filesystem
+                        try:
+                            os.link(memory_path, archive_path)
+                        except OSError:
+                            shutil.copyfile(memory_path, archive_path)
                         result["archived_files"] += 1
                     except Exception:
                         pass  # Skip if can't archive
 
-            # Remove the orphaned file
-            if memory_path.exists():
-                try:
-                    memory_path.unlink()
-                    result["removed_files"] += 1
-                except Exception:
-                    pass  # Skip if can't remove
+        # Remove the orphaned files
+        result["removed_files"] = self._unlink_files(orphan_paths)
 
         # Handle missing files (index entries with no file)
         for memory_id in issues["missing_files"]:
@@ -802,14 +1328,10 @@ class MemoryStore:
 
         # Handle orphaned archives (archive files for non-existent memories)
         if clean_orphaned_archives:
-            for memory_id in issues["orphaned_archives"]:
-                archive_path = self.archives_path / f"{memory_id}.md"
-                if archive_path.exists():
-                    try:
-                        archive_path.unlink()
-                        result["removed_orphaned_archives"] += 1
-                    except Exception:
-                        pass  # Skip if can't remove
+            result["removed_orphaned_archives"] = self._unlink_files([
+                self.archives_path / f"{memory_id}.md"
+                for memory_id in issues["orphaned_archives"]
+            ])
 
         # Write modified data
         if index_modified:
@@ -819,3 +1341,29 @@ class MemoryStore:
             self._write_stats(stats)
 
         return result
+
+    def _unlink_files(self, paths: list[Path]) -> int:
+        """
+        Remove files, skipping any that are missing or cannot be removed.
+
+        Batches of PARALLEL_UNLINK_MIN or more files are spread over worker
+        threads so the per-file syscall latency overlaps.
+
+        Returns:
+            Number of files removed
+        """
+        if len(paths) < self.PARALLEL_UNLINK_MIN:
+            return sum(map(self._try_unlink, paths))
+
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(self._try_unlink, paths))
+
+    @staticmethod
+    def _try_unlink(path: Path) -> bool:
+        """Remove a file, returning whether it was removed."""
+        try:
+            path.unlink()
+            return True
+        except Exception:
+            return False  # Skip if missing or can't remove
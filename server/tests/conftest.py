@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import shutil
 import sys
 import tempfile
@@ -15,7 +14,7 @@ import pytest
 _server_path = Path(__file__).parent.parent
 sys.path.insert(0, str(_server_path))
 
-from store import MemoryStore
+from store import MemoryStore, _json_dumps
 from priority import PriorityCalculator
 
 
@@ -35,15 +34,28 @@ def temp_ltm_dir():
     shutil.rmtree(temp_dir)
 
 
-@pytest.fixture
-def store(temp_ltm_dir):
-    """Create a MemoryStore with temporary directory."""
-    return MemoryStore(base_path=temp_ltm_dir)
+@pytest.fixture(scope="module")
+def _module_store(tmp_path_factory):
+    """One MemoryStore per test module, backed by its own temp directory."""
+    return MemoryStore(
+        base_path=tmp_path_factory.mktemp("ltm_store"), durable=False
+    )
 
 
 @pytest.fixture
+def store(_module_store):
+    """Provide an empty MemoryStore, reset rather than rebuilt per test."""
+    _module_store.reset()
+    return _module_store
+
+
+@pytest.fixture(scope="module")
 def priority_calculator():
-    """Create a PriorityCalculator instance."""
+    """Create a PriorityCalculator instance shared by a test module.
+
+    Scores are a pure function of their inputs; the only state is the
+    per-session score cache, which never changes a result.
+    """
     return PriorityCalculator()
 
 
@@ -152,16 +164,13 @@ def sample_state():
 def populated_store(temp_ltm_dir, sample_index, sample_stats, sample_state):
     """Create a store with pre-populated test data."""
     # Write index
-    with open(temp_ltm_dir / "index.json", "w") as f:
-        json.dump(sample_index, f)
+    (temp_ltm_dir / "index.json").write_bytes(_json_dumps(sample_index))
 
     # Write stats
-    with open(temp_ltm_dir / "stats.json", "w") as f:
-        json.dump(sample_stats, f)
+    (temp_ltm_dir / "stats.json").write_bytes(_json_dumps(sample_stats))
 
     # Write state
-    with open(temp_ltm_dir / "state.json", "w") as f:
-        json.dump(sample_state, f)
+    (temp_ltm_dir / "state.json").write_bytes(_json_dumps(sample_state))
 
     # Create memory files
     for mem_id in sample_index["memories"]:
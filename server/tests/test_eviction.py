@@ -223,6 +223,31 @@ class TestRunEviction:
         # Should process only 2 (batch_size)
         assert stats["processed"] == 2
 
+    def test_run_writes_index_once_per_batch(self, store, monkeypatch):
+        """Run writes index.json once for the whole batch."""
+        config = EvictionConfig(max_memories=0, batch_size=3)
+        manager = EvictionManager(store, config)
+
+        for i in range(3):
+            store.create(topic=f"Memory {i}", content=f"Content {i}")
+
+        writes = []
+        original_write = store._atomic_write_json
+
+        def counting_write(path, data):
+            writes.append(path.name)
+            original_write(path, data)
+
+        monkeypatch.setattr(store, "_atomic_write_json", counting_write)
+
+        stats = manager.run()
+
+        assert stats["phase_transitions"]["0_to_1"] == 3
+        assert writes.count("index.json") == 1
+        store.invalidate_cache()
+        phases = [m["phase"] for m in store._read_index()["memories"].values()]
+        assert phases == [1, 1, 1]
+
     def test_run_processes_lowest_priority_first(self, store):
         """Run evicts lowest priority memories first."""
         config = EvictionConfig(max_memories=2, batch_size=2)
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
 import shutil
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import pytest
@@ -12,6 +16,7 @@ import pytest
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import mcp_server
 from mcp_server import (
     handle_store_memory,
     handle_recall,
@@ -22,52 +27,135 @@ from mcp_server import (
     handle_ltm_check,
     handle_ltm_fix,
     handle_reset_tokens,
+    call_tool,
+    list_tools,
     _extract_tags,
-    store,
 )
+from store import MemoryStore
+
+# Temp store directories are removed in the background between tests
+_cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ltm_cleanup")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _drain_cleanup_pool():
+    """Wait for background temp-dir removal to finish after the module."""
+    yield
+    _cleanup_pool.shutdown(wait=True)
+
+
+# "key: value" lines rendered by _format_result that tests care about
+_RESULT_FIELD_RE = re.compile(r"^(success|id|difficulty|tags|topic):\s*(.*)$", re.M)
+
+
+@dataclass
+class HandlerResult:
+    """Fields parsed from a handler's rendered "key: value" output."""
+
+    raw: str
+    success: bool = False
+    id: str | None = None
+    difficulty: float | None = None
+    topic: str | None = None
+    tags: list[str] = field(default_factory=list)
+
+
+def parse_handler_text(text: str) -> HandlerResult:
+    """Parse known fields from handler output in a single pass."""
+    parsed = HandlerResult(raw=text)
+    for key, value in _RESULT_FIELD_RE.findall(text):
+        value = value.strip()
+        if key == "success":
+            parsed.success = value == "True"
+        elif key == "difficulty":
+            parsed.difficulty = float(value)
+        elif key == "tags":
+            parsed.tags = [tag for tag in value.split(", ") if tag]
+        else:
+            setattr(parsed, key, value)
+    return parsed
+
+
+def assert_contains_all(text: str, *needles: str) -> None:
+    """Assert that every needle occurs in text, scanning it once.
+
+    Needles are combined into a single alternation pattern. Matches are
+    non-overlapping, so any needle not reported by the scan is checked
+    directly before the assertion fails.
+    """
+    pattern = re.compile("|".join(map(re.escape, needles)))
+    found = set(pattern.findall(text))
+    missing = [n for n in needles if n not in found and n not in text]
+    assert not missing, f"missing {missing!r} in:\n{text}"
+
+
+@pytest.fixture(scope="session")
+def store_template(tmp_path_factory):
+    """Build an empty store layout once; clean_store copies it per test."""
+    template = tmp_path_factory.mktemp("ltm_store_template")
+    template_store = MemoryStore(base_path=template)
+    template_store._write_index(template_store._read_index())
+    template_store._write_stats(template_store._read_stats())
+    template_store._write_state(template_store._read_state())
+    return template
 
 
 @pytest.fixture
-def clean_store():
+def clean_store(monkeypatch, store_template):
     """Create a clean store for each test."""
-    # Create temp directory
+    # Create temp directory from the empty-store template
     temp_dir = tempfile.mkdtemp(prefix="ltm_mcp_test_")
     temp_path = Path(temp_dir)
+    shutil.copytree(store_template, temp_path, dirs_exist_ok=True)
 
-    # Backup original paths
-    original_base = store.base_path
-    original_memories = store.memories_path
-    original_archives = store.archives_path
-    original_index = store.index_path
-    original_stats = store.stats_path
-    original_state = store.state_path
-
-    # Set up temp paths
-    store.base_path = temp_path
-    store.memories_path = temp_path / "memories"
-    store.archives_path = temp_path / "archives"
-    store.index_path = temp_path / "index.json"
-    store.stats_path = temp_path / "stats.json"
-    store.state_path = temp_path / "state.json"
-
-    store.memories_path.mkdir(parents=True)
-    store.archives_path.mkdir(parents=True)
-
-    store.invalidate_cache()
-
-    yield store
-
-    # Restore original paths
-    store.base_path = original_base
-    store.memories_path = original_memories
-    store.archives_path = original_archives
-    store.index_path = original_index
-    store.stats_path = original_stats
-    store.state_path = original_state
-    store.invalidate_cache()
+    # Point the server at a dedicated store (monkeypatch restores the original)
+    test_store = MemoryStore(base_path=temp_path, durable=False)
+    monkeypatch.setattr(mcp_server, "store", test_store)
+
+    yield test_store
 
     # Cleanup
-    shutil.rmtree(temp_dir)
+    _cleanup_pool.submit(shutil.rmtree, temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def set_session(clean_store):
+    """Return a helper that updates current_session fields in one write."""
+    return clean_store._update_session
+
+
+@pytest.fixture
+def orphan_archive(clean_store):
+    """Create an archive file with no matching memory.
+
+    Integrity check and fix only list and unlink archive files, so an
+    empty file is enough.
+    """
+    archive_path = clean_store.archives_path / "orphan_archive.md"
+    archive_path.touch()
+    return archive_path
+
+
+@pytest.fixture(scope="class")
+def populated_store(request):
+    """Create a store holding the test class's MEMORIES, shared by its tests.
+
+    Populated once per class through handle_store_memory. Tests using it
+    must not mutate the store; mutating tests should use clean_store.
+    """
+    temp_dir = tempfile.mkdtemp(prefix="ltm_mcp_test_")
+    test_store = MemoryStore(base_path=Path(temp_dir))
+
+    async def _populate():
+        for memory in request.cls.MEMORIES:
+            await handle_store_memory(dict(memory))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(mcp_server, "store", test_store)
+        asyncio.run(_populate())
+        yield test_store
+
+    _cleanup_pool.submit(shutil.rmtree, temp_dir, ignore_errors=True)
 
 
 class TestExtractTags:
@@ -115,9 +203,9 @@ class TestStoreMemoryTool:
         })
 
         assert len(result) == 1
-        text = result[0].text
-        assert "success: True" in text
-        assert "mem_" in text
+        parsed = parse_handler_text(result[0].text)
+        assert parsed.success
+        assert parsed.id.startswith("mem_")
 
     async def test_store_memory_with_tags(self, clean_store):
         """Store memory with explicit tags."""
@@ -127,9 +215,9 @@ class TestStoreMemoryTool:
             "tags": ["test", "example"],
         })
 
-        text = result[0].text
-        assert "success: True" in text
-        assert "test" in text
+        parsed = parse_handler_text(result[0].text)
+        assert parsed.success
+        assert parsed.tags == ["test", "example"]
 
     async def test_store_memory_auto_tag(self, clean_store):
         """Store memory with auto-tagging."""
@@ -139,10 +227,10 @@ class TestStoreMemoryTool:
             "auto_tag": True,
         })
 
-        text = result[0].text
-        assert "success: True" in text
+        parsed = parse_handler_text(result[0].text)
+        assert parsed.success
         # Should have auto-generated tags
-        assert "tags:" in text
+        assert parsed.tags
 
     async def test_store_memory_with_difficulty(self, clean_store):
         """Store memory with provided difficulty score (overrides auto-calculation)."""
@@ -152,10 +240,11 @@ class TestStoreMemoryTool:
             "difficulty": 0.9,
         })
 
-        text = result[0].text
-        assert "success: True" in text
+        parsed = parse_handler_text(result[0].text)
+        assert parsed.success
         # Provided difficulty should be used instead of calculated
-        assert "difficulty: 0.9" in text
+        assert parsed.difficulty == 0.9
+        assert result[0].meta["difficulty"] == 0.9
 
     async def test_store_memory_difficulty_clamped(self, clean_store):
         """Provided difficulty is clamped to 0.0-1.0 range."""
@@ -165,8 +254,7 @@ class TestStoreMemoryTool:
             "content": "Content",
             "difficulty": 1.5,
         })
-        text = result[0].text
-        assert "difficulty: 1.0" in text
+        assert result[0].meta["difficulty"] == 1.0
 
         # Test below 0.0
         result = await handle_store_memory({
@@ -174,102 +262,73 @@ class TestStoreMemoryTool:
             "content": "Content",
             "difficulty": -0.5,
         })
-        text = result[0].text
-        assert "difficulty: 0.0" in text
+        assert result[0].meta["difficulty"] == 0.0
 
-    async def test_store_memory_auto_calculates_difficulty(self, clean_store):
+    async def test_store_memory_auto_calculates_difficulty(self, set_session):
         """Without provided difficulty, difficulty is auto-calculated from session metrics."""
         # Set up session state with metrics that would produce non-zero difficulty
-        state = store._read_state()
-        state["current_session"]["tool_failures"] = 5
-        state["current_session"]["tool_successes"] = 5
-        state["current_session"]["session_tokens"] = 50000
-        store._write_state(state)
+        set_session(tool_failures=5, tool_successes=5, session_tokens=50000)
 
         result = await handle_store_memory({
             "topic": "Auto difficulty",
             "content": "Content",
         })
 
-        text = result[0].text
-        assert "success: True" in text
+        assert parse_handler_text(result[0].text).success
         # Should have calculated difficulty > 0 due to session metrics
-        assert "difficulty:" in text
-        # Extract the difficulty value
-        for line in text.split("\n"):
-            if line.startswith("difficulty:"):
-                difficulty = float(line.split(":")[1].strip())
-                assert difficulty > 0  # Should be non-zero due to metrics
-                break
+        assert result[0].meta["difficulty"] > 0
 
 
 @pytest.mark.asyncio
 class TestRecallTool:
     """Tests for recall tool."""
 
-    async def test_recall_finds_memory(self, clean_store):
-        """Recall finds matching memory."""
-        # Store a memory first
-        await handle_store_memory({
-            "topic": "Database optimization",
-            "content": "Optimized query performance",
-        })
+    # Stored once per class by populated_store; tests only read from it
+    MEMORIES = [
+        {"topic": "Database optimization", "content": "Optimized query performance"},
+        *({"topic": f"Test memory {i}", "content": "Test content"} for i in range(5)),
+        {
+            "topic": "Generic topic",
+            "content": "Generic content",
+            "tags": ["postgresql", "optimization"],
+        },
+        {"topic": "Other topic", "content": "Other content", "tags": ["api"]},
+        {"topic": "Topic", "content": "Content", "tags": ["postgresql"]},
+    ]
 
+    async def test_recall_finds_memory(self, populated_store):
+        """Recall finds matching memory."""
         result = await handle_recall({"query": "database"})
 
         text = result[0].text
         assert "Database optimization" in text
         assert "mem_" in text
 
-    async def test_recall_no_results(self, clean_store):
+    async def test_recall_no_results(self, populated_store):
         """Recall returns message when no matches."""
         result = await handle_recall({"query": "nonexistent"})
 
         text = result[0].text
         assert "No memories found" in text
 
-    async def test_recall_respects_limit(self, clean_store):
+    async def test_recall_respects_limit(self, populated_store):
         """Recall respects limit parameter."""
-        # Store multiple memories
-        for i in range(5):
-            await handle_store_memory({
-                "topic": f"Test memory {i}",
-                "content": "Test content",
-            })
-
         result = await handle_recall({"query": "test", "limit": 2})
 
         text = result[0].text
         # Should find some but respect limit
         assert "Found" in text
 
-    async def test_recall_finds_by_tag(self, clean_store):
+    async def test_recall_finds_by_tag(self, populated_store):
         """Recall finds memory by tag."""
-        await handle_store_memory({
-            "topic": "Generic topic",
-            "content": "Generic content",
-            "tags": ["postgresql", "optimization"],
-        })
-        await handle_store_memory({
-            "topic": "Other topic",
-            "content": "Other content",
-            "tags": ["api"],
-        })
-
         result = await handle_recall({"query": "postgresql"})
 
         text = result[0].text
         assert "Generic topic" in text
         assert "Other topic" not in text
 
-    async def test_recall_finds_by_partial_tag(self, clean_store):
+    async def test_recall_finds_by_partial_tag(self, populated_store):
         """Recall finds memory by partial tag match."""
-        await handle_store_memory({
-            "topic": "Topic",
-            "content": "Content",
-            "tags": ["postgresql"],
-        })
-
         result = await handle_recall({"query": "postgres"})
 
         text = result[0].text
@@ -280,54 +339,34 @@ class TestRecallTool:
 class TestListMemoriesTool:
     """Tests for list_memories tool."""
 
-    async def test_list_all_memories(self, clean_store):
+    # Stored once per class by populated_store; tests only read from it
+    MEMORIES = [
+        {"topic": "Memory 1", "content": "Content 1"},
+        {"topic": "Memory 2", "content": "Content 2"},
+        {"topic": "Tagged memory", "content": "Content", "tags": ["important"]},
+        {"topic": "Other memory", "content": "Content", "tags": ["other"]},
+        {"topic": "Database topic", "content": "Content"},
+        {"topic": "API topic", "content": "Content"},
+    ]
+
+    async def test_list_all_memories(self, populated_store):
         """List all memories."""
-        # Store memories
-        await handle_store_memory({
-            "topic": "Memory 1",
-            "content": "Content 1",
-        })
-        await handle_store_memory({
-            "topic": "Memory 2",
-            "content": "Content 2",
-        })
-
         result = await handle_list_memories({})
 
         text = result[0].text
         assert "Memory 1" in text
         assert "Memory 2" in text
 
-    async def test_list_filter_by_tag(self, clean_store):
+    async def test_list_filter_by_tag(self, populated_store):
         """List memories filtered by tag."""
-        await handle_store_memory({
-            "topic": "Tagged memory",
-            "content": "Content",
-            "tags": ["important"],
-        })
-        await handle_store_memory({
-            "topic": "Other memory",
-            "content": "Content",
-            "tags": ["other"],
-        })
-
         result = await handle_list_memories({"tag": "important"})
 
         text = result[0].text
         assert "Tagged memory" in text
         assert "Other memory" not in text
 
-    async def test_list_filter_by_keyword(self, clean_store):
+    async def test_list_filter_by_keyword(self, populated_store):
         """List memories filtered by keyword."""
-        await handle_store_memory({
-            "topic": "Database topic",
-            "content": "Content",
-        })
-        await handle_store_memory({
-            "topic": "API topic",
-            "content": "Content",
-        })
-
         result = await handle_list_memories({"keyword": "database"})
 
         text = result[0].text
@@ -355,15 +394,8 @@ class TestGetMemoryTool:
             "tags": ["test"],
         })
 
-        # Extract ID from result
-        text = store_result[0].text
-        memory_id = None
-        for line in text.split("\n"):
-            if line.startswith("id:"):
-                memory_id = line.split(":")[1].strip()
-                break
-
-        assert memory_id is not None
+        memory_id = store_result[0].meta["id"]
+        assert memory_id in store_result[0].text
 
         # Get the memory
         result = await handle_get_memory({"memory_id": memory_id})
@@ -372,6 +404,8 @@ class TestGetMemoryTool:
         assert "Test memory" in text
         assert "Full content here" in text
         assert memory_id in text
+        assert result[0].meta["id"] == memory_id
+        assert result[0].meta["tags"] == ["test"]
 
     async def test_get_memory_not_found(self, clean_store):
         """Get memory returns error for unknown ID."""
@@ -392,14 +426,7 @@ class TestForgetTool:
             "topic": "To forget",
             "content": "Content",
         })
-
-        # Extract ID
-        text = store_result[0].text
-        memory_id = None
-        for line in text.split("\n"):
-            if line.startswith("id:"):
-                memory_id = line.split(":")[1].strip()
-                break
+        memory_id = store_result[0].meta["id"]
 
         # Forget it
         result = await handle_forget({"memory_id": memory_id})
@@ -407,6 +434,7 @@ class TestForgetTool:
         text = result[0].text
         assert "deleted" in text.lower()
         assert "archived" in text.lower()
+        assert result[0].meta == {"id": memory_id, "archived": True}
 
         # Verify it's gone
         get_result = await handle_get_memory({"memory_id": memory_id})
@@ -433,17 +461,25 @@ class TestLtmStatusTool:
         assert "0" in text
         assert "Session Count:" in text
 
+    async def test_ltm_status_counts_archives(self, orphan_archive):
+        """Status counts archive files."""
+        result = await handle_ltm_status({})
+
+        assert "**Archived:** 1" in result[0].text
+
     async def test_ltm_status_with_memories(self, clean_store):
         """Status shows memory counts."""
         # Store some memories
-        await handle_store_memory({
-            "topic": "Memory 1",
-            "content": "Content",
-        })
-        await handle_store_memory({
-            "topic": "Memory 2",
-            "content": "Content",
-        })
+        await asyncio.gather(
+            handle_store_memory({
+                "topic": "Memory 1",
+                "content": "Content",
+            }),
+            handle_store_memory({
+                "topic": "Memory 2",
+                "content": "Content",
+            }),
+        )
 
         result = await handle_ltm_status({})
 
@@ -457,10 +493,13 @@ class TestLtmStatusTool:
         result = await handle_ltm_status({})
 
         text = result[0].text
-        assert "Token Counting" in text
-        assert "Current segment tokens:" in text
-        assert "Tool calls:" in text
-        assert "Estimated difficulty:" in text
+        assert_contains_all(
+            text,
+            "Token Counting",
+            "Current segment tokens:",
+            "Tool calls:",
+            "Estimated difficulty:",
+        )
 
     async def test_ltm_status_shows_token_counting_enabled(self, clean_store):
         """Status shows token counting enabled with offline tokenizer."""
@@ -471,14 +510,10 @@ class TestLtmStatusTool:
         assert "Enabled" in text
         assert "offline tokenizer" in text
 
-    async def test_ltm_status_shows_session_metrics(self, clean_store):
+    async def test_ltm_status_shows_session_metrics(self, set_session):
         """Status shows current session metrics."""
         # Set up some session state
-        state = store._read_state()
-        state["current_session"]["session_tokens"] = 5000
-        state["current_session"]["tool_failures"] = 2
-        state["current_session"]["tool_successes"] = 10
-        store._write_state(state)
+        set_session(session_tokens=5000, tool_failures=2, tool_successes=10)
 
         result = await handle_ltm_status({})
 
@@ -492,57 +527,42 @@ class TestLtmStatusTool:
 class TestResetTokensTool:
     """Tests for reset_tokens tool."""
 
-    async def test_reset_tokens_resets_session_tokens(self, clean_store):
+    async def test_reset_tokens_resets_session_tokens(self, clean_store, set_session):
         """reset_tokens sets session_tokens to 0."""
         # Set up session state with tokens
-        state = store._read_state()
-        state["current_session"]["session_tokens"] = 10000
-        store._write_state(state)
+        set_session(session_tokens=10000)
 
         await handle_reset_tokens({})
 
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["current_session"]["session_tokens"] == 0
 
-    async def test_reset_tokens_resets_tool_counts(self, clean_store):
+    async def test_reset_tokens_resets_tool_counts(self, clean_store, set_session):
         """reset_tokens sets tool counts to 0."""
         # Set up session state with tool counts
-        state = store._read_state()
-        state["current_session"]["tool_failures"] = 5
-        state["current_session"]["tool_successes"] = 20
-        store._write_state(state)
+        set_session(tool_failures=5, tool_successes=20)
 
         await handle_reset_tokens({})
 
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["current_session"]["tool_failures"] == 0
         assert state["current_session"]["tool_successes"] == 0
 
-    async def test_reset_tokens_returns_before_after_info(self, clean_store):
+    async def test_reset_tokens_returns_before_after_info(self, set_session):
         """reset_tokens returns before and after state."""
         # Set up session state
-        state = store._read_state()
-        state["current_session"]["session_tokens"] = 25000
-        state["current_session"]["tool_failures"] = 3
-        state["current_session"]["tool_successes"] = 15
-        store._write_state(state)
+        set_session(session_tokens=25000, tool_failures=3, tool_successes=15)
 
         result = await handle_reset_tokens({})
 
         text = result[0].text
-        assert "Before" in text
-        assert "After" in text
+        assert_contains_all(text, "Before", "After", "Ready for new topic")
         assert "25,000" in text or "25000" in text  # Before tokens
-        assert "Ready for new topic" in text
 
-    async def test_reset_tokens_shows_estimated_difficulty(self, clean_store):
+    async def test_reset_tokens_shows_estimated_difficulty(self, set_session):
         """reset_tokens shows estimated difficulty before reset."""
         # Set up session state
-        state = store._read_state()
-        state["current_session"]["session_tokens"] = 50000
-        state["current_session"]["tool_failures"] = 2
-        state["current_session"]["tool_successes"] = 8
-        store._write_state(state)
+        set_session(session_tokens=50000, tool_failures=2, tool_successes=8)
 
         result = await handle_reset_tokens({})
 
@@ -553,8 +573,6 @@ class TestResetTokensTool:
 
     async def test_reset_tokens_call_tool_dispatch(self, clean_store):
         """call_tool routes to reset_tokens."""
-        from mcp_server import call_tool
-
         result = await call_tool("reset_tokens", {})
 
         assert len(result) == 1
@@ -565,94 +583,30 @@ class TestResetTokensTool:
 class TestCallToolDispatcher:
     """Tests for the call_tool dispatcher function."""
 
-    async def test_call_tool_store_memory(self, clean_store):
-        """call_tool routes to store_memory."""
-        from mcp_server import call_tool
-
-        result = await call_tool("store_memory", {
-            "topic": "Test",
-            "content": "Content",
-        })
-
-        assert len(result) == 1
-        assert "success" in result[0].text
-
-    async def test_call_tool_recall(self, clean_store):
-        """call_tool routes to recall."""
-        from mcp_server import call_tool
-
-        result = await call_tool("recall", {"query": "test"})
+    @pytest.mark.parametrize("name,args,expected", [
+        ("store_memory", {"topic": "Test", "content": "Content"}, "success"),
+        ("recall", {"query": "test"}, None),
+        ("list_memories", {}, None),
+        ("get_memory", {"memory_id": "mem_test"}, None),
+        ("forget", {"memory_id": "mem_test"}, None),
+        ("ltm_status", {}, "Total Memories"),
+        ("ltm_check", {}, "Integrity Check"),
+        ("ltm_fix", {}, "Integrity Fix"),
+        ("unknown_tool", {}, "Unknown tool"),
+    ])
+    async def test_call_tool_routes(self, clean_store, name, args, expected):
+        """call_tool routes each tool name to its handler."""
+        result = await call_tool(name, args)
 
         assert len(result) == 1
-
-    async def test_call_tool_list_memories(self, clean_store):
-        """call_tool routes to list_memories."""
-        from mcp_server import call_tool
-
-        result = await call_tool("list_memories", {})
-
-        assert len(result) == 1
-
-    async def test_call_tool_get_memory(self, clean_store):
-        """call_tool routes to get_memory."""
-        from mcp_server import call_tool
-
-        result = await call_tool("get_memory", {"memory_id": "mem_test"})
-
-        assert len(result) == 1
-
-    async def test_call_tool_forget(self, clean_store):
-        """call_tool routes to forget."""
-        from mcp_server import call_tool
-
-        result = await call_tool("forget", {"memory_id": "mem_test"})
-
-        assert len(result) == 1
-
-    async def test_call_tool_ltm_status(self, clean_store):
-        """call_tool routes to ltm_status."""
-        from mcp_server import call_tool
-
-        result = await call_tool("ltm_status", {})
-
-        assert len(result) == 1
-        assert "Total Memories" in result[0].text
-
-    async def test_call_tool_ltm_check(self, clean_store):
-        """call_tool routes to ltm_check."""
-        from mcp_server import call_tool
-
-        result = await call_tool("ltm_check", {})
-
-        assert len(result) == 1
-        assert "Integrity Check" in result[0].text
-
-    async def test_call_tool_ltm_fix(self, clean_store):
-        """call_tool routes to ltm_fix."""
-        from mcp_server import call_tool
-
-        result = await call_tool("ltm_fix", {})
-
-        assert len(result) == 1
-        assert "Integrity Fix" in result[0].text
-
-    async def test_call_tool_unknown(self, clean_store):
-        """call_tool handles unknown tool name."""
-        from mcp_server import call_tool
-
-        result = await call_tool("unknown_tool", {})
-
-        assert len(result) == 1
-        assert "Unknown tool" in result[0].text
+        if expected is not None:
+            assert expected in result[0].text
 
     async def test_call_tool_exception(self, clean_store, monkeypatch):
         """call_tool handles exceptions gracefully."""
-        from mcp_server import call_tool
-
         async def failing_handler(args):
             raise ValueError("Test error")
 
-        import mcp_server
         monkeypatch.setattr(mcp_server, "handle_store_memory", failing_handler)
 
         result = await call_tool("store_memory", {
@@ -670,8 +624,6 @@ class TestListToolsFunction:
 
     async def test_list_tools_returns_all_tools(self):
         """list_tools returns all 9 tools."""
-        from mcp_server import list_tools
-
         tools = await list_tools()
 
         assert len(tools) == 9
@@ -686,6 +638,14 @@ class TestListToolsFunction:
         assert "ltm_fix" in tool_names
         assert "reset_tokens" in tool_names
 
+    async def test_list_tools_reuses_definitions(self):
+        """list_tools builds tool definitions once and reuses them."""
+        first = await list_tools()
+        second = await list_tools()
+
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second))
+
 
 @pytest.mark.asyncio
 class TestListMemoriesFilters:
@@ -721,9 +681,7 @@ class TestListMemoriesFilters:
         })
 
         text = result[0].text
-        assert "phase=0" in text
-        assert "tag='test'" in text
-        assert "keyword='query'" in text
+        assert_contains_all(text, "phase=0", "tag='test'", "keyword='query'")
 
 
 @pytest.mark.asyncio
@@ -741,13 +699,12 @@ class TestLtmCheck:
         result = await handle_ltm_check({})
 
         text = result[0].text
-        assert "Healthy" in text
-        assert "No integrity issues" in text
+        assert_contains_all(text, "Healthy", "No integrity issues")
 
     async def test_check_orphaned_file(self, clean_store):
         """Check detects orphaned memory files."""
         # Create orphaned file directly
-        orphan_path = store.memories_path / "orphan_mem.md"
+        orphan_path = clean_store.memories_path / "orphan_mem.md"
         orphan_path.write_text("---\nid: orphan_mem\ntopic: Orphan\n---\nContent")
 
         result = await handle_ltm_check({})
@@ -760,13 +717,13 @@ class TestLtmCheck:
     async def test_check_missing_file(self, clean_store):
         """Check detects missing memory files."""
         # Create index entry without file
-        index = store._read_index()
+        index = clean_store._read_index()
         index["memories"]["missing_mem"] = {
             "topic": "Missing",
             "tags": [],
             "phase": 0,
         }
-        store._write_index(index)
+        clean_store._write_index(index)
 
         result = await handle_ltm_check({})
 
@@ -778,9 +735,9 @@ class TestLtmCheck:
     async def test_check_orphaned_stats(self, clean_store):
         """Check detects orphaned stats entries."""
         # Create stats entry without index entry
-        stats = store._read_stats()
+        stats = clean_store._read_stats()
         stats["memories"]["orphan_stats"] = {"access_count": 5}
-        store._write_stats(stats)
+        clean_store._write_stats(stats)
 
         result = await handle_ltm_check({})
 
@@ -789,12 +746,8 @@ class TestLtmCheck:
         assert "Orphaned Stats" in text
         assert "orphan_stats" in text
 
-    async def test_check_orphaned_archives(self, clean_store):
+    async def test_check_orphaned_archives(self, orphan_archive):
         """Check detects orphaned archive files."""
-        # Create archive file for non-existent memory
-        archive_path = store.archives_path / "orphan_archive.md"
-        archive_path.write_text("---\nid: orphan_archive\n---\nOld archived content")
-
         result = await handle_ltm_check({})
 
         text = result[0].text
@@ -818,7 +771,7 @@ class TestLtmFix:
     async def test_fix_orphaned_file(self, clean_store):
         """Fix removes orphaned files."""
         # Create orphaned file
-        orphan_path = store.memories_path / "orphan_mem.md"
+        orphan_path = clean_store.memories_path / "orphan_mem.md"
         orphan_path.write_text("---\nid: orphan_mem\n---\nContent")
 
         result = await handle_ltm_fix({"archive_orphans": True})
@@ -834,9 +787,9 @@ class TestLtmFix:
     async def test_fix_missing_file_entry(self, clean_store):
         """Fix removes index entries for missing files."""
         # Create index entry without file
-        index = store._read_index()
+        index = clean_store._read_index()
         index["memories"]["missing_mem"] = {"topic": "Missing", "tags": [], "phase": 0}
-        store._write_index(index)
+        clean_store._write_index(index)
 
         result = await handle_ltm_fix({})
 
@@ -844,15 +797,15 @@ class TestLtmFix:
         assert "Repairs completed" in text
 
         # Verify index entry removed
-        index = store._read_index()
+        index = clean_store._read_index()
         assert "missing_mem" not in index["memories"]
 
     async def test_fix_orphaned_stats(self, clean_store):
         """Fix removes orphaned stats entries."""
         # Create orphaned stats
-        stats = store._read_stats()
+        stats = clean_store._read_stats()
         stats["memories"]["orphan_stats"] = {"access_count": 1}
-        store._write_stats(stats)
+        clean_store._write_stats(stats)
 
         result = await handle_ltm_fix({})
 
@@ -860,13 +813,13 @@ class TestLtmFix:
         assert "Repairs completed" in text
 
         # Verify stats entry removed
-        stats = store._read_stats()
+        stats = clean_store._read_stats()
         assert "orphan_stats" not in stats["memories"]
 
     async def test_fix_archives_before_removal(self, clean_store):
         """Fix archives orphaned files before removal."""
         # Create orphaned file
-        orphan_path = store.memories_path / "orphan_mem.md"
+        orphan_path = clean_store.memories_path / "orphan_mem.md"
         orphan_path.write_text("---\nid: orphan_mem\n---\nContent to archive")
 
         result = await handle_ltm_fix({"archive_orphans": True})
@@ -875,19 +828,18 @@ class TestLtmFix:
         assert "Archived" in text
 
         # Verify archive created
-        archive_path = store.archives_path / "orphan_mem.md"
+        archive_path = clean_store.archives_path / "orphan_mem.md"
         assert archive_path.exists()
 
     async def test_fix_issues_remain(self, clean_store, monkeypatch):
         """Fix shows message when issues remain after fix."""
-        import mcp_server
 
         # Create an orphaned file to trigger fix
-        orphan_path = store.memories_path / "orphan_mem.md"
+        orphan_path = clean_store.memories_path / "orphan_mem.md"
         orphan_path.write_text("---\nid: orphan_mem\n---\nContent")
 
         call_count = [0]
-        original_check = store.check_integrity
+        original_check = clean_store.check_integrity
 
         def mock_check_integrity():
             call_count[0] += 1
@@ -912,11 +864,9 @@ class TestLtmFix:
         assert "Repairs completed" in text
         assert "Some issues may remain" in text
 
-    async def test_fix_clean_orphaned_archives(self, clean_store):
+    async def test_fix_clean_orphaned_archives(self, orphan_archive):
         """Fix removes orphaned archives when clean_orphaned_archives is True."""
-        # Create orphaned archive file
-        archive_path = store.archives_path / "orphan_archive.md"
-        archive_path.write_text("---\nid: orphan_archive\n---\nOld archived content")
+        archive_path = orphan_archive
 
         result = await handle_ltm_fix({"clean_orphaned_archives": True})
 
@@ -925,11 +875,9 @@ class TestLtmFix:
         assert "orphaned archive" in text.lower()
         assert not archive_path.exists()
 
-    async def test_fix_clean_orphaned_archives_default_false(self, clean_store):
+    async def test_fix_clean_orphaned_archives_default_false(self, orphan_archive):
         """Fix does not remove orphaned archives by default."""
-        # Create orphaned archive file
-        archive_path = store.archives_path / "orphan_archive.md"
-        archive_path.write_text("---\nid: orphan_archive\n---\nOld archived content")
+        archive_path = orphan_archive
 
         result = await handle_ltm_fix({})
 
@@ -939,11 +887,9 @@ class TestLtmFix:
         # Archive should still exist
         assert archive_path.exists()
 
-    async def test_fix_orphaned_archives_only(self, clean_store):
+    async def test_fix_orphaned_archives_only(self, orphan_archive):
         """Fix handles case where only orphaned archives exist."""
-        # Create orphaned archive file (no other issues)
-        archive_path = store.archives_path / "orphan_archive.md"
-        archive_path.write_text("---\nid: orphan_archive\n---\nContent")
+        archive_path = orphan_archive
 
         # Without clean_orphaned_archives, nothing to fix
         result = await handle_ltm_fix({})
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
+from priority import (
+    PriorityCalculator,
+    _frequency_from_count,
+    calculate_difficulty,
+    calculate_priority,
+)
+
 
 class TestPriorityCalculator:
     """Tests for PriorityCalculator class."""
@@ -24,7 +33,7 @@ class TestPriorityCalculator:
         # recency = 1.0 * 0.3 = 0.3 (same session)
         # frequency = 0.5 * 0.3 = 0.15 (5/10 capped)
         expected = 0.2 + 0.3 + 0.15
-        assert abs(priority - expected) < 0.001
+        assert abs(priority - expected) < 1e-9
 
     def test_priority_max_score(self, priority_calculator):
         """Maximum values for all factors should give priority = 1.0."""
@@ -74,7 +83,7 @@ class TestPriorityCalculator:
         # difficulty = 0.0
         # recency = 1.0 * 0.3 = 0.3
         # frequency = 0.0
-        assert abs(priority - 0.3) < 0.001
+        assert abs(priority - 0.3) < 1e-9
 
     def test_priority_frequency_weight(self, priority_calculator):
         """Verify frequency contributes 30%."""
@@ -89,6 +98,34 @@ class TestPriorityCalculator:
         # frequency = 1.0 * 0.3 = 0.3
         assert 0.29 < priority < 0.31
 
+    def test_subclass_weights_honoured(self):
+        """Overriding a weight attribute changes every scoring path."""
+
+        class DifficultyOnly(PriorityCalculator):
+            DIFFICULTY_WEIGHT = 1.0
+            RECENCY_WEIGHT = 0.0
+            FREQUENCY_WEIGHT = 0.0
+
+        calc = DifficultyOnly()
+        memory = {"difficulty": 0.6}
+        stats = {"access_count": 10, "last_session": 5}
+
+        assert calc.calculate(memory, stats, 5) == 0.6
+        assert calc.specialize(5)(memory, stats) == 0.6
+        assert calc.calculate_batch([0.6], [10], [5], 5) == [0.6]
+
+    def test_calculator_is_pure(self, priority_calculator):
+        """Repeated calls with identical arguments return identical results."""
+        memory = {"difficulty": 0.35}
+        stats = {"access_count": 4, "last_session": 7}
+
+        first = priority_calculator.calculate(memory, stats, 9)
+        second = priority_calculator.calculate(memory, stats, 9)
+
+        assert first == second
+        assert memory == {"difficulty": 0.35}
+        assert stats == {"access_count": 4, "last_session": 7}
+
     def test_priority_none_stats(self, priority_calculator):
         """Handle None stats gracefully."""
         memory = {"difficulty": 0.5}
@@ -97,6 +134,106 @@ class TestPriorityCalculator:
         # Should use defaults: access_count=0, last_session=0
         assert 0 <= priority <= 1
 
+    def test_priority_batch_matches_scalar(self, priority_calculator):
+        """calculate_batch gives the same scores as calculate() per memory."""
+        rng = random.Random(42)
+        rows = [
+            (rng.random(), rng.randint(0, 30), rng.randint(0, 120))
+            for _ in range(10_000)
+        ]
+        current_session = 100
+
+        batch = priority_calculator.calculate_batch(
+            [d for d, _, _ in rows],
+            [n for _, n, _ in rows],
+            [s for _, _, s in rows],
+            current_session,
+        )
+
+        scalar = [
+            priority_calculator.calculate(
+                {"difficulty": d},
+                {"access_count": n, "last_session": s},
+                current_session,
+            )
+            for d, n, s in rows
+        ]
+        assert batch == scalar
+
+    def test_rank_top_k_matches_full_sort(self, priority_calculator):
+        """rank_top_k returns the first k positions of a full sort."""
+        rng = random.Random(7)
+        difficulty = [round(rng.random(), 1) for _ in range(1000)]
+        access_count = [rng.randint(0, 12) for _ in range(1000)]
+        last_session = [rng.randint(0, 20) for _ in range(1000)]
+
+        scores = priority_calculator.calculate_batch(
+            difficulty, access_count, last_session, 20
+        )
+        expected = sorted(range(1000), key=lambda i: scores[i], reverse=True)
+
+        for k in (0, 1, 10, 999, 1000, 2000):
+            top = priority_calculator.rank_top_k(
+                difficulty, access_count, last_session, 20, k
+            )
+            assert top == expected[:k]
+
+    def test_specialize_matches_calculate(self, priority_calculator):
+        """A session-specialized scorer gives the same result as calculate()."""
+        score = priority_calculator.specialize(20)
+        cases = [
+            ({"difficulty": 0.7}, {"access_count": 3, "last_session": 18}),
+            ({"difficulty": 0.1}, {"access_count": 25, "last_session": 20}),
+            ({}, {"last_session": 30}),
+            ({"difficulty": 0.5}, None),
+        ]
+
+        for memory, stats in cases:
+            assert score(memory, stats) == PriorityCalculator().calculate(
+                memory, stats, 20
+            )
+
+    def test_priority_batch_empty(self, priority_calculator):
+        """calculate_batch handles an empty batch."""
+        assert priority_calculator.calculate_batch([], [], [], 5) == []
+
+    def test_score_follows_session_change(self, priority_calculator):
+        """Repeated calls agree, and a later session lowers the score."""
+        memory = {"difficulty": 0.5}
+        stats = {"access_count": 5, "last_session": 10}
+
+        same_session = priority_calculator.calculate(memory, stats, 10)
+        assert priority_calculator.calculate(memory, stats, 10) == same_session
+
+        next_session = priority_calculator.calculate(memory, stats, 11)
+        assert next_session < same_session
+
+    def test_score_follows_access_count_change(self, priority_calculator):
+        """Changed stats are not served a stale score."""
+        memory = {"difficulty": 0.5}
+        stats = {"access_count": 1, "last_session": 10}
+
+        before = priority_calculator.calculate(memory, stats, 10)
+        stats["access_count"] = 8
+        after = priority_calculator.calculate(memory, stats, 10)
+
+        assert after > before
+        assert after == PriorityCalculator().calculate(memory, stats, 10)
+
+    def test_weight_override_after_first_call(self):
+        """A weight changed on an instance applies to its next calculate()."""
+        calc = PriorityCalculator()
+        memory = {"difficulty": 0.5}
+        stats = {"access_count": 1, "last_session": 5}
+        calc.calculate(memory, stats, 5)
+
+        calc.DIFFICULTY_WEIGHT = 0.0
+        fresh = PriorityCalculator()
+        fresh.DIFFICULTY_WEIGHT = 0.0
+
+        assert calc.calculate(memory, stats, 5) == fresh.calculate(memory, stats, 5)
+        assert calc.calculate(memory, stats, 5) == pytest.approx(0.3 + 0.03)
+
     # =========================================================================
     # Recency Calculation Tests
     # =========================================================================
@@ -121,19 +258,19 @@ class TestPriorityCalculator:
         recency = priority_calculator._calculate_recency(
             {"last_session": 8}, current_session=10
         )
-        assert abs(recency - 1 / 3) < 0.001
+        assert abs(recency - 1 / 3) < 1e-9
 
         # 9 sessions ago
         recency = priority_calculator._calculate_recency(
             {"last_session": 1}, current_session=10
         )
-        assert abs(recency - 0.1) < 0.001
+        assert abs(recency - 0.1) < 1e-9
 
     def test_recency_missing_last_session(self, priority_calculator):
         """Missing last_session should default to 0."""
         recency = priority_calculator._calculate_recency({}, current_session=10)
         # 10 sessions since = 1/(1+10) ≈ 0.091
-        assert abs(recency - 1 / 11) < 0.001
+        assert abs(recency - 1 / 11) < 1e-9
 
     # =========================================================================
     # Frequency Calculation Tests
@@ -159,6 +296,17 @@ class TestPriorityCalculator:
         frequency = priority_calculator._calculate_frequency({"access_count": 5})
         assert frequency == 0.5
 
+    def test_frequency_cache_hit_rate(self, priority_calculator):
+        """Repeated access counts are served from the frequency cache."""
+        _frequency_from_count.cache_clear()
+        priority_calculator.calculate_batch(
+            [0.5] * 100, [i % 10 for i in range(100)], [0] * 100, 1
+        )
+
+        info = _frequency_from_count.cache_info()
+        assert info.misses == 10
+        assert info.hits == 90
+
     # =========================================================================
     # Difficulty Calculation Tests
     # =========================================================================
@@ -221,8 +369,6 @@ class TestModuleLevelFunctions:
 
     def test_calculate_priority_function(self):
         """Test module-level calculate_priority function."""
-        from priority import calculate_priority
-
         memory = {"difficulty": 0.5}
         stats = {"access_count": 5, "last_session": 10}
 
@@ -232,8 +378,6 @@ class TestModuleLevelFunctions:
 
     def test_calculate_difficulty_function(self):
         """Test module-level calculate_difficulty function."""
-        from priority import calculate_difficulty
-
         difficulty = calculate_difficulty(
             tool_failures=5, tool_successes=5, compacted=True
         )
@@ -258,130 +402,78 @@ class TestDifficultyWithTokens:
 
     def test_new_weights_sum_to_one(self, priority_calculator):
         """TC-15: New weights sum to 1.0 (0.25 + 0.15 + 0.35 + 0.25)."""
+        weights = priority_calculator.DIFFICULTY_WEIGHTS_WITH_TOKENS
+        assert weights == (0.25, 0.15, 0.35, 0.25)
         # The new formula weights should sum to 1.0
-        weights_sum = 0.25 + 0.15 + 0.35 + 0.25
-        assert weights_sum == 1.0
-
-    def test_token_contribution(self, priority_calculator):
-        """TC-16: 100k tokens only (max) contributes 0.35 to difficulty."""
-        # With 100k tokens (normalized to 1.0) and all other factors at 0
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=0,
-            tool_successes=0,
-            compacted=False,
-            session_tokens=100000,
-            token_normalize_cap=100000,
-        )
-
-        # token_usage = 1.0 * 0.35 = 0.35
-        # all other factors = 0
-        assert abs(difficulty - 0.35) < 0.001
-
-    def test_backward_compatibility_no_tokens(self, priority_calculator):
-        """TC-17: When session_tokens=0, uses old formula."""
-        # Old formula: (failure_rate * 0.5) + (tool_count * 0.3) + (compaction * 0.2)
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=5,
-            tool_successes=5,
-            compacted=True,
-            session_tokens=0,
-        )
-
-        # failure_rate = 0.5 * 0.5 = 0.25
-        # tool_count = 10/50 * 0.3 = 0.06
-        # compaction = 1.0 * 0.2 = 0.2
-        # total = 0.51
-        expected_old = 0.25 + 0.06 + 0.2
-        assert abs(difficulty - expected_old) < 0.01
-
-    def test_max_difficulty_with_tokens(self, priority_calculator):
-        """TC-18: All factors maxed gives difficulty = 1.0."""
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=100,  # 100% failure rate
-            tool_successes=0,
-            compacted=True,
-            session_tokens=100000,  # Max tokens
-            token_normalize_cap=100000,
-        )
-
-        # failure_rate = 1.0 * 0.25 = 0.25
-        # tool_count = 1.0 * 0.15 = 0.15
-        # tokens = 1.0 * 0.35 = 0.35
-        # compaction = 1.0 * 0.25 = 0.25
-        # total = 1.0
-        assert difficulty == 1.0
+        assert sum(weights) == 1.0
 
     def test_old_formula_weights(self, priority_calculator):
         """TC-19: Old formula uses 0.5/0.3/0.2 weights without tokens."""
-        # All factors at max with old formula (no tokens)
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=100,
-            tool_successes=0,
-            compacted=True,
-            session_tokens=0,  # No tokens = old formula
-        )
-
-        # failure_rate = 1.0 * 0.5 = 0.5
-        # tool_count = 1.0 * 0.3 = 0.3
-        # compaction = 1.0 * 0.2 = 0.2
-        # total = 1.0
-        assert difficulty == 1.0
-
-    def test_partial_token_usage(self, priority_calculator):
-        """50% token usage contributes 0.175 (half of 0.35)."""
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=0,
-            tool_successes=0,
-            compacted=False,
-            session_tokens=50000,
-            token_normalize_cap=100000,
-        )
-
-        # token_usage = 0.5 * 0.35 = 0.175
-        assert abs(difficulty - 0.175) < 0.001
-
-    def test_combined_factors_with_tokens(self, priority_calculator):
-        """Test combined factors with token counting."""
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=5,
-            tool_successes=5,
-            compacted=True,
-            session_tokens=50000,
-            token_normalize_cap=100000,
-        )
-
-        # failure_rate = 0.5 * 0.25 = 0.125
-        # tool_count = 0.2 * 0.15 = 0.03 (10 tools / 50 cap)
-        # tokens = 0.5 * 0.35 = 0.175
-        # compaction = 1.0 * 0.25 = 0.25
-        # total = 0.58
-        expected = 0.125 + 0.03 + 0.175 + 0.25
-        assert abs(difficulty - expected) < 0.01
-
-    def test_token_cap_respected(self, priority_calculator):
-        """Tokens above cap are still capped at 1.0 normalized."""
-        difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=0,
-            tool_successes=0,
-            compacted=False,
-            session_tokens=200000,  # 2x the cap
-            token_normalize_cap=100000,
-        )
-
-        # token_usage should be capped at 1.0
-        # difficulty = 1.0 * 0.35 = 0.35
-        assert abs(difficulty - 0.35) < 0.001
-
-    def test_custom_token_cap(self, priority_calculator):
-        """Custom token cap works correctly."""
+        weights = priority_calculator.DIFFICULTY_WEIGHTS_WITHOUT_TOKENS
+        assert weights == (0.5, 0.3, 0.0, 0.2)
+
+    @pytest.mark.parametrize(
+        "failures,successes,compacted,tokens,cap,expected,tol",
+        [
+            # TC-16: 100k tokens only (max) contributes 0.35
+            pytest.param(0, 0, False, 100000, 100000, 0.35, 1e-3, id="token_contribution"),
+            # TC-17: session_tokens=0 uses old formula: 0.25 + 0.06 + 0.2
+            pytest.param(5, 5, True, 0, 100000, 0.51, 0.01, id="backward_compatibility"),
+            # TC-18: all factors maxed: 0.25 + 0.15 + 0.35 + 0.25
+            pytest.param(100, 0, True, 100000, 100000, 1.0, 0.0, id="max_with_tokens"),
+            # TC-19: all factors maxed with old formula: 0.5 + 0.3 + 0.2
+            pytest.param(100, 0, True, 0, 100000, 1.0, 0.0, id="max_old_formula"),
+            # 50% token usage contributes half of 0.35
+            pytest.param(0, 0, False, 50000, 100000, 0.175, 1e-3, id="partial_tokens"),
+            # 0.125 + 0.03 (10 tools / 50 cap) + 0.175 + 0.25
+            pytest.param(5, 5, True, 50000, 100000, 0.58, 0.01, id="combined_factors"),
+            # Tokens above cap are capped at 1.0 normalized
+            pytest.param(0, 0, False, 200000, 100000, 0.35, 1e-3, id="token_cap"),
+            # token_usage = 25000/50000 = 0.5 with a custom cap
+            pytest.param(0, 0, False, 25000, 50000, 0.175, 1e-3, id="custom_token_cap"),
+        ],
+    )
+    def test_difficulty_formula(
+        self, priority_calculator, failures, successes, compacted, tokens, cap,
+        expected, tol,
+    ):
+        """Difficulty matches the expected formula value for each case."""
         difficulty = priority_calculator.calculate_difficulty(
-            tool_failures=0,
-            tool_successes=0,
-            compacted=False,
-            session_tokens=25000,
-            token_normalize_cap=50000,  # Custom cap
+            tool_failures=failures,
+            tool_successes=successes,
+            compacted=compacted,
+            session_tokens=tokens,
+            token_normalize_cap=cap,
         )
 
-        # token_usage = 25000/50000 = 0.5
-        # difficulty = 0.5 * 0.35 = 0.175
-        assert abs(difficulty - 0.175) < 0.001
+        assert abs(difficulty - expected) <= tol
+
+    def test_difficulty_core_matches_reference(self, priority_calculator):
+        """Weight-tuple formula matches the two-branch reference formula."""
+        def reference(failures, successes, compacted, tokens, cap):
+            total = failures + successes
+            failure_rate = failures / total if total else 0.0
+            tool_norm = min(1.0, total / 50) if total else 0.0
+            bonus = 1.0 if compacted else 0.0
+            if tokens > 0:
+                token_norm = min(1.0, tokens / cap)
+                value = (
+                    failure_rate * 0.25
+                    + tool_norm * 0.15
+                    + token_norm * 0.35
+                    + bonus * 0.25
+                )
+            else:
+                value = failure_rate * 0.5 + tool_norm * 0.3 + bonus * 0.2
+            return max(0.0, min(1.0, value))
+
+        rng = random.Random(1234)
+        for _ in range(10_000):
+            args = (
+                rng.randint(0, 60),
+                rng.randint(0, 60),
+                rng.random() < 0.5,
+                rng.choice([0, rng.randint(1, 300_000)]),
+                rng.randint(1, 200_000),
+            )
+            assert priority_calculator.calculate_difficulty(*args) == reference(*args)
@@ -23,51 +23,22 @@ from mcp_server import (
     hook_session_end,
     hook_health,
     hook_shutdown,
-    store,
     shutdown_event,
     parse_args,
 )
+from store import MemoryStore
 
 
 @pytest.fixture
-def clean_store():
+def clean_store(monkeypatch):
     """Create a clean store for each test."""
     temp_dir = tempfile.mkdtemp(prefix="ltm_server_test_")
-    temp_path = Path(temp_dir)
-
-    # Backup original paths
-    original_base = store.base_path
-    original_memories = store.memories_path
-    original_archives = store.archives_path
-    original_index = store.index_path
-    original_stats = store.stats_path
-    original_state = store.state_path
-
-    # Set up temp paths
-    store.base_path = temp_path
-    store.memories_path = temp_path / "memories"
-    store.archives_path = temp_path / "archives"
-    store.index_path = temp_path / "index.json"
-    store.stats_path = temp_path / "stats.json"
-    store.state_path = temp_path / "state.json"
-
-    # Create directories
-    store.memories_path.mkdir(parents=True)
-    store.archives_path.mkdir(parents=True)
-
-    # Reset caches
-    store.invalidate_cache()
-
-    yield temp_path
-
-    # Restore original paths
-    store.base_path = original_base
-    store.memories_path = original_memories
-    store.archives_path = original_archives
-    store.index_path = original_index
-    store.stats_path = original_stats
-    store.state_path = original_state
-    store.invalidate_cache()
+
+    # A fresh store has empty caches, so no invalidation is needed
+    test_store = MemoryStore(base_path=Path(temp_dir))
+    monkeypatch.setattr(mcp_server, "store", test_store)
+
+    yield test_store
 
     # Cleanup
     shutil.rmtree(temp_dir)
@@ -101,7 +72,7 @@ class TestHookSessionStart:
         assert data["success"] is True
 
         # Verify session count incremented
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["session_count"] >= 1
 
     @pytest.mark.asyncio
@@ -111,7 +82,7 @@ class TestHookSessionStart:
 
         await hook_session_start(request)
 
-        state = store._read_state()
+        state = clean_store._read_state()
         session = state["current_session"]
         assert "started_at" in session
         assert session["tool_failures"] == 0
@@ -122,7 +93,7 @@ class TestHookSessionStart:
     async def test_session_start_returns_memories(self, clean_store, mock_request):
         """session_start returns loaded memories in context."""
         # Create some memories
-        store.create(topic="Test Memory", content="Content", tags=["test"])
+        clean_store.create(topic="Test Memory", content="Content", tags=["test"])
 
         request = mock_request({})
         response = await hook_session_start(request)
@@ -162,9 +133,9 @@ class TestHookTrackDifficulty:
     async def test_track_difficulty_success(self, clean_store, mock_request):
         """track_difficulty tracks successful tool use."""
         # Initialize session state
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {"tool_failures": 0, "tool_successes": 0}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         payload = {
             "tool_name": "Write",
@@ -179,16 +150,16 @@ class TestHookTrackDifficulty:
         assert data["tracked"] is True
         assert data["is_failure"] is False
 
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["current_session"]["tool_successes"] == 1
         assert state["current_session"]["tool_failures"] == 0
 
     @pytest.mark.asyncio
     async def test_track_difficulty_failure_error_key(self, clean_store, mock_request):
         """track_difficulty tracks failed tool use with error key."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {"tool_failures": 0, "tool_successes": 0}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         payload = {
             "tool_name": "Bash",
@@ -201,15 +172,15 @@ class TestHookTrackDifficulty:
 
         assert data["is_failure"] is True
 
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["current_session"]["tool_failures"] == 1
 
     @pytest.mark.asyncio
     async def test_track_difficulty_failure_success_false(self, clean_store, mock_request):
         """track_difficulty tracks failed tool use with success: false."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {"tool_failures": 0, "tool_successes": 0}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         payload = {
             "tool_name": "Write",
@@ -225,9 +196,9 @@ class TestHookTrackDifficulty:
     @pytest.mark.asyncio
     async def test_track_difficulty_error_in_text(self, clean_store, mock_request):
         """track_difficulty detects Error in response text."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {"tool_failures": 0, "tool_successes": 0}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         payload = {
             "tool_name": "Bash",
@@ -269,9 +240,9 @@ class TestHookPreCompact:
     @pytest.mark.asyncio
     async def test_pre_compact_marks_compaction(self, clean_store, mock_request):
         """pre_compact marks session as compacted."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {"compacted": False}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         request = mock_request({})
 
@@ -280,16 +251,16 @@ class TestHookPreCompact:
 
         assert data["success"] is True
 
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["current_session"]["compacted"] is True
 
     @pytest.mark.asyncio
     async def test_pre_compact_increments_compaction_count(self, clean_store, mock_request):
         """pre_compact increments compaction counter."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["compaction_count"] = 5
         state["current_session"] = {}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         request = mock_request({})
 
@@ -315,13 +286,13 @@ class TestHookSessionEnd:
     @pytest.mark.asyncio
     async def test_session_end_resets_session_state(self, clean_store, mock_request):
         """session_end resets current session state."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {
             "tool_failures": 5,
             "tool_successes": 10,
             "compacted": True,
         }
-        store._write_state(state)
+        clean_store._write_state(state)
 
         request = mock_request({})
 
@@ -330,38 +301,38 @@ class TestHookSessionEnd:
 
         assert data["success"] is True
 
-        state = store._read_state()
+        state = clean_store._read_state()
         assert state["current_session"] == {}
 
     @pytest.mark.asyncio
     async def test_session_end_updates_priorities(self, clean_store, mock_request):
         """session_end updates memory priorities."""
         # Create a memory
-        mem_id = store.create(topic="Test", content="Content", difficulty=0.5)
+        mem_id = clean_store.create(topic="Test", content="Content", difficulty=0.5)
 
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {"tool_failures": 0, "tool_successes": 10}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         request = mock_request({})
 
         await hook_session_end(request)
 
         # Verify priority was updated
-        stats = store._read_stats()
+        stats = clean_store._read_stats()
         assert mem_id in stats["memories"]
         assert "priority" in stats["memories"][mem_id]
 
     @pytest.mark.asyncio
     async def test_session_end_returns_difficulty(self, clean_store, mock_request):
         """session_end returns calculated session difficulty."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["current_session"] = {
             "tool_failures": 5,
             "tool_successes": 5,
             "compacted": True,
         }
-        store._write_state(state)
+        clean_store._write_state(state)
 
         request = mock_request({})
 
@@ -482,14 +453,14 @@ class TestSessionEndEviction:
     async def test_session_end_triggers_eviction(self, clean_store, mock_request):
         """session_end triggers eviction when over threshold."""
         # Set low threshold
-        state = store._read_state()
+        state = clean_store._read_state()
         state["config"] = {"max_memories": 3, "eviction_batch_size": 2}
         state["current_session"] = {}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         # Create more memories than threshold
         for i in range(5):
-            store.create(
+            clean_store.create(
                 topic=f"Memory {i}",
                 content=f"Content {i}",
                 difficulty=0.1 * i,
@@ -507,13 +478,13 @@ class TestSessionEndEviction:
     @pytest.mark.asyncio
     async def test_session_end_no_eviction_needed(self, clean_store, mock_request):
         """session_end doesn't run eviction when under threshold."""
-        state = store._read_state()
+        state = clean_store._read_state()
         state["config"] = {"max_memories": 100}
         state["current_session"] = {}
-        store._write_state(state)
+        clean_store._write_state(state)
 
         # Create just one memory
-        store.create(topic="Memory", content="Content")
+        clean_store.create(topic="Memory", content="Content")
 
         request = mock_request({})
 
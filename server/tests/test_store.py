@@ -1,4 +1,9 @@
-"""Unit tests for store.py - Memory Storage."""
+"""Unit tests for store.py - Memory Storage.
+
+Tests share one store per module, in its own temp directory, that is reset
+before each test. Run in parallel under pytest-xdist with
+``-n auto --dist=loadscope``, which keeps a module on one worker.
+"""
 
 from __future__ import annotations
 
@@ -11,7 +16,60 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from store import MemoryStore, MemoryNotFoundError
+from store import MemoryStore, MemoryNotFoundError, _json_dumps
+
+
+# Pre-serialized data files for the read-from-disk edge cases
+_EXISTING_INDEX = _json_dumps({
+    "version": 1,
+    "memories": {
+        "mem_existing": {
+            "topic": "Existing memory",
+            "tags": ["test"],
+            "phase": 0,
+            "difficulty": 0.5,
+            "created_at": "2026-01-01T00:00:00Z",
+        }
+    },
+})
+
+_EXISTING_STATE = _json_dumps({
+    "version": 1,
+    "session_count": 42,
+    "current_session": {},
+    "compaction_count": 5,
+    "config": {"max_memories": 200},
+})
+
+_STATE_WITHOUT_SESSION_TOKENS = _json_dumps({
+    "version": 1,
+    "session_count": 10,
+    "current_session": {"tool_failures": 5},
+    "compaction_count": 0,
+    "config": {},
+})
+
+_STATE_WITHOUT_TOKEN_COUNTING = _json_dumps({
+    "version": 1,
+    "session_count": 5,
+    "current_session": {},
+    "compaction_count": 0,
+    "config": {"max_memories": 50},
+})
+
+_STATE_WITHOUT_CURRENT_SESSION = _json_dumps({
+    "version": 1,
+    "session_count": 5,
+    "compaction_count": 0,
+    "config": {},
+})
+
+_STATE_WITHOUT_CONFIG = _json_dumps({
+    "version": 1,
+    "session_count": 5,
+    "current_session": {},
+    "compaction_count": 0,
+})
 
 
 class TestCreateOperations:
@@ -67,6 +125,18 @@ class TestCreateOperations:
         assert id1.startswith("mem_")
         assert id2.startswith("mem_")
 
+    def test_generate_id_redraws_existing(self, store, monkeypatch):
+        """An ID already in use is redrawn."""
+        import store as store_module
+
+        draws = iter([0xABC, 0xABC, 0xDEF])
+        monkeypatch.setattr(
+            store_module._id_random, "getrandbits", lambda bits: next(draws)
+        )
+
+        assert store._generate_id() == "mem_00000abc"
+        assert store._generate_id({"mem_00000abc"}) == "mem_00000def"
+
     def test_create_memory_sets_timestamps(self, store, sample_memory):
         """Verify timestamps set correctly."""
         memory_id = store.create(
@@ -97,6 +167,66 @@ class TestCreateOperations:
         assert index["memories"][id1]["difficulty"] == 0.0
         assert index["memories"][id2]["difficulty"] == 1.0
 
+    def test_create_many(self, store, monkeypatch):
+        """create_many creates every memory with one index and stats write."""
+        writes = []
+        original_write = store._atomic_write_json
+
+        def counting_write(path, data):
+            writes.append(path.name)
+            original_write(path, data)
+
+        monkeypatch.setattr(store, "_atomic_write_json", counting_write)
+
+        ids = store.create_many([
+            {"topic": "First", "content": "Content 1", "tags": ["a"]},
+            {"topic": "Second", "content": "Content 2", "difficulty": 0.8},
+        ])
+
+        assert writes == ["index.json", "stats.json"]
+        assert len(set(ids)) == 2
+        assert store.read(ids[0])["tags"] == ["a"]
+        assert store.read(ids[1])["difficulty"] == 0.8
+
+    def test_batch_defers_index_and_stats_writes(self, store, monkeypatch):
+        """Writes inside batch() reach disk once, when the batch exits."""
+        writes = []
+        original_write = store._atomic_write_json
+
+        def counting_write(path, data):
+            writes.append(path.name)
+            original_write(path, data)
+
+        monkeypatch.setattr(store, "_atomic_write_json", counting_write)
+
+        with store.batch():
+            with store.batch():
+                first = store.create(topic="First", content="Content 1")
+            second = store.create(topic="Second", content="Content 2")
+            store.update(first, tags=["a"])
+            assert writes == []
+            assert not store.index_path.exists()
+
+        assert sorted(writes) == ["index.json", "stats.json"]
+        index = json.loads(store.index_path.read_bytes())
+        assert set(index["memories"]) == {first, second}
+        assert index["memories"][first]["tags"] == ["a"]
+
+    def test_batch_flushes_on_error(self, store):
+        """A failing batch still writes the changes made before the error."""
+        with pytest.raises(RuntimeError):
+            with store.batch():
+                memory_id = store.create(topic="Topic", content="Content")
+                raise RuntimeError("boom")
+
+        index = json.loads(store.index_path.read_bytes())
+        assert memory_id in index["memories"]
+
+    def test_create_many_empty(self, store):
+        """create_many with no specs writes nothing."""
+        assert store.create_many([]) == []
+        assert not store.index_path.exists()
+
 
 class TestReadOperations:
     """Tests for memory read operations."""
@@ -129,7 +259,7 @@ class TestReadOperations:
 
         # Read twice
         store.read(memory_id)
-        store.invalidate_cache()
+        store.invalidate_cache("stats")
         store.read(memory_id)
 
         stats = store._read_stats()
@@ -147,6 +277,43 @@ class TestReadOperations:
         stats = store._read_stats()
         assert "accessed_at" in stats["memories"][memory_id]
 
+    def test_read_memory_buffers_stats_until_flush(self, store):
+        """read() stats reach stats.json on flush_stats()."""
+        memory_id = store.create(topic="Topic", content="Content")
+        on_disk = store.stats_path.read_bytes()
+
+        store.read(memory_id)
+        assert store.stats_path.read_bytes() == on_disk
+
+        store.flush_stats()
+        stats = json.loads(store.stats_path.read_bytes())
+        assert stats["memories"][memory_id]["access_count"] == 1
+
+    def test_read_memory_flushes_stats_after_interval(self, store, monkeypatch):
+        """Buffered stats are written every STATS_FLUSH_INTERVAL reads."""
+        monkeypatch.setattr(MemoryStore, "STATS_FLUSH_INTERVAL", 3)
+        memory_id = store.create(topic="Topic", content="Content")
+
+        for _ in range(3):
+            store.read(memory_id)
+
+        stats = json.loads(store.stats_path.read_bytes())
+        assert stats["memories"][memory_id]["access_count"] == 3
+
+    @pytest.mark.parametrize("query", ["list", "search"])
+    def test_list_and_search_flush_buffered_stats(self, store, query):
+        """list() and search() write buffered read() stats first."""
+        memory_id = store.create(topic="Topic", content="Content")
+        store.read(memory_id)
+
+        if query == "list":
+            store.list()
+        else:
+            store.search("Topic")
+
+        stats = json.loads(store.stats_path.read_bytes())
+        assert stats["memories"][memory_id]["access_count"] == 1
+
     def test_read_memory_no_stats_update(self, store, sample_memory):
         """Reading with update_stats=False doesn't update stats."""
         memory_id = store.create(
@@ -272,6 +439,20 @@ class TestDeleteOperations:
         archive_path = store.archives_path / f"{memory_id}.md"
         assert archive_path.exists()
 
+    def test_delete_memory_moves_file_to_archive(self, store):
+        """Archiving moves the memory file instead of rewriting it."""
+        memory_id = store.create(topic="Topic", content="Content")
+        memory_path = store.memories_path / f"{memory_id}.md"
+        original = memory_path.read_bytes()
+        inode = memory_path.stat().st_ino
+
+        store.delete(memory_id, archive=True)
+
+        archive_path = store.archives_path / f"{memory_id}.md"
+        assert not memory_path.exists()
+        assert archive_path.read_bytes() == original
+        assert archive_path.stat().st_ino == inode
+
     def test_delete_memory_no_archive(self, store, sample_memory):
         """Delete with archive=False doesn't create archive."""
         memory_id = store.create(
@@ -336,6 +517,16 @@ class TestListOperations:
         assert len(result) == 1
         assert result[0]["id"] == id1
 
+    def test_list_memories_tag_sees_update(self, store):
+        """Tag filter follows tag changes and ignores duplicate tags."""
+        memory_id = store.create(topic="Tagged", content="Content", tags=["a", "a"])
+        assert [m["id"] for m in store.list(tag="a")] == [memory_id]
+
+        store.update(memory_id, tags=["b"])
+
+        assert store.list(tag="a") == []
+        assert [m["id"] for m in store.list(tag="b")] == [memory_id]
+
     def test_list_memories_filter_by_keyword(self, store):
         """Filter by keyword in topic."""
         id1 = store.create(topic="Database optimization", content="Content")
@@ -358,6 +549,27 @@ class TestListOperations:
         assert len(result) == 1
         assert result[0]["id"] == id1
 
+    def test_list_memories_keyword_sees_topic_update(self, store):
+        """Keyword filter uses the current topic after an update."""
+        memory_id = store.create(topic="Database optimization", content="Content")
+        assert len(store.list(keyword="database")) == 1
+
+        store.update(memory_id, topic="Cache tuning")
+
+        assert store.list(keyword="database") == []
+        assert [m["id"] for m in store.list(keyword="CACHE")] == [memory_id]
+
+    def test_list_memories_phase_sees_update(self, store):
+        """Phase filter uses the current phase after an update."""
+        first = store.create(topic="First", content="Content")
+        second = store.create(topic="Second", content="Content")
+
+        store.update(first, phase=2)
+
+        assert [m["id"] for m in store.list(phase=0)] == [second]
+        assert [m["id"] for m in store.list(phase=2)] == [first]
+        assert store.list(phase=3) == []
+
     def test_list_memories_combined_filters(self, store):
         """Multiple filters return intersection."""
         store.create(
@@ -383,8 +595,9 @@ class TestListOperations:
 
     def test_list_memories_pagination(self, store):
         """Limit and offset work correctly."""
-        for i in range(10):
-            store.create(topic=f"Memory {i}", content=f"Content {i}")
+        store.create_many(
+            [{"topic": f"Memory {i}", "content": f"Content {i}"} for i in range(10)]
+        )
 
         result = store.list(limit=3)
         assert len(result) == 3
@@ -398,15 +611,11 @@ class TestListOperations:
     def test_list_memories_sorted_by_priority(self, store):
         """Verify priority ordering (highest first)."""
         # Create with different difficulties
-        id_low = store.create(
-            topic="Low priority", content="Content", difficulty=0.1
-        )
-        id_high = store.create(
-            topic="High priority", content="Content", difficulty=0.9
-        )
-        id_med = store.create(
-            topic="Medium priority", content="Content", difficulty=0.5
-        )
+        id_low, id_high, id_med = store.create_many([
+            {"topic": "Low priority", "content": "Content", "difficulty": 0.1},
+            {"topic": "High priority", "content": "Content", "difficulty": 0.9},
+            {"topic": "Medium priority", "content": "Content", "difficulty": 0.5},
+        ])
 
         result = store.list()
 
@@ -415,6 +624,23 @@ class TestListOperations:
         assert result[1]["id"] == id_med
         assert result[2]["id"] == id_low
 
+    def test_list_memories_ranking_follows_stats(self, store):
+        """Cached ranking is rebuilt when priorities change."""
+        first, second = store.create_many([
+            {"topic": "First", "content": "Content", "difficulty": 0.9},
+            {"topic": "Second", "content": "Content", "difficulty": 0.1},
+        ])
+        assert [m["id"] for m in store.list()] == [first, second]
+
+        stats = store._read_stats()
+        stats["memories"][second]["priority"] = 1.0
+        store._write_stats(stats)
+
+        result = store.list()
+        assert [m["id"] for m in result] == [second, first]
+        assert result[0]["priority"] == 1.0
+        assert [m["id"] for m in store.list(offset=1, limit=1)] == [first]
+
 
 class TestSearchOperations:
     """Tests for memory search operations."""
@@ -459,12 +685,35 @@ class TestSearchOperations:
 
     def test_search_respects_limit(self, store):
         """Search respects limit parameter."""
-        for i in range(10):
-            store.create(topic=f"Database {i}", content=f"Content {i}")
+        store.create_many(
+            [{"topic": f"Database {i}", "content": f"Content {i}"} for i in range(10)]
+        )
 
         result = store.search("database", limit=3)
         assert len(result) == 3
 
+    def test_search_reads_content_for_top_matches_only(self, store, monkeypatch):
+        """Topic matches outside the limit never have their content read."""
+        ids = store.create_many(
+            [
+                {"topic": f"Database {i}", "content": "Content", "difficulty": i / 10}
+                for i in range(10)
+            ]
+        )
+        read_ids = []
+        memory_content = store._memory_content
+
+        def tracking_memory_content(memory_id):
+            read_ids.append(memory_id)
+            return memory_content(memory_id)
+
+        monkeypatch.setattr(store, "_memory_content", tracking_memory_content)
+
+        result = store.search("database", limit=3)
+
+        assert [m["id"] for m in result] == ids[:-4:-1]
+        assert read_ids == ids[:-4:-1]
+
     def test_search_returns_summary(self, store):
         """Search results include summary."""
         store.create(
@@ -539,8 +788,12 @@ class TestSearchOperations:
 class TestFileOperations:
     """Tests for file operations."""
 
-    def test_atomic_write_creates_file(self, store):
-        """Atomic write creates file."""
+    def test_atomic_write_creates_file(self, temp_ltm_dir, monkeypatch):
+        """Atomic write creates file via temp file + rename, cleaning up on failure."""
+        import os
+
+        # The store fixture is non-durable; atomic writes need the default
+        store = MemoryStore(base_path=temp_ltm_dir)
         test_data = {"test": "data"}
         test_path = store.base_path / "test.json"
 
@@ -549,6 +802,110 @@ class TestFileOperations:
         assert test_path.exists()
         with open(test_path) as f:
             assert json.load(f) == test_data
+        assert sorted(store.base_path.glob("*.json")) == [test_path]
+
+        def failing_write_fd(fd, data):
+            os.close(fd)
+            raise OSError("Simulated write failure")
+
+        monkeypatch.setattr(MemoryStore, "_write_fd", staticmethod(failing_write_fd))
+
+        with pytest.raises(OSError):
+            store._atomic_write_json(test_path, {"test": "new"})
+
+        assert sorted(store.base_path.glob("*.json")) == [test_path]
+        with open(test_path) as f:
+            assert json.load(f) == test_data
+
+    def test_reset_empties_store(self, store):
+        """reset() removes memories, archives and data files."""
+        memory_id = store.create("Topic", "Content", tags=["tag"])
+        store.delete(memory_id, archive=True)
+        store.create("Second", "Content")
+
+        store.reset()
+
+        assert store.list() == []
+        assert list(store.memories_path.iterdir()) == []
+        assert list(store.archives_path.iterdir()) == []
+        assert not store.index_path.exists()
+        assert not store.stats_path.exists()
+        assert not store.state_path.exists()
+
+    def test_non_durable_store_writes_in_place(self, temp_ltm_dir, monkeypatch):
+        """durable=False writes data and memory files without temp files."""
+        import tempfile
+
+        def no_mkstemp(*args, **kwargs):
+            raise AssertionError("temp file created")
+
+        monkeypatch.setattr(tempfile, "mkstemp", no_mkstemp)
+        store = MemoryStore(base_path=temp_ltm_dir, durable=False)
+
+        memory_id = store.create("Topic", "Content")
+        store.update(memory_id, content="Changed")
+
+        assert store.read(memory_id)["content"] == "Changed"
+        assert memory_id in store._read_index()["memories"]
+
+    def test_invalidate_cache_single_kind(self, store):
+        """invalidate_cache(kind) clears only the named data file."""
+        store.create("Topic", "Content")
+        index = store._read_index()
+
+        store.invalidate_cache("stats")
+
+        assert store._stats_cache is None
+        assert store._read_index() is index
+
+        with pytest.raises(ValueError):
+            store.invalidate_cache("memories")
+
+    def test_invalidate_cache_files(self, store):
+        """invalidate_cache("files") drops listings but keeps data files."""
+        store.create("Topic", "Content")
+        index = store._read_index()
+        store._dir_cache[str(store.memories_path)] = (0, frozenset({"stale"}))
+
+        store.invalidate_cache("files")
+
+        assert store._dir_cache == {}
+        assert store._read_index() is index
+
+    def test_json_backends_produce_same_layout(self, monkeypatch):
+        """orjson and stdlib serialization write identical bytes."""
+        pytest.importorskip("orjson")
+        import store as store_module
+
+        data = {
+            "version": 1,
+            "memories": {
+                "mem_test001": {
+                    "topic": "Caf\u00e9 \"quoted\"",
+                    "tags": ["database", "performance"],
+                    "phase": 0,
+                    "difficulty": 0.7,
+                    "created_at": "2026-01-15T10:00:00Z",
+                },
+                "mem_test002": {"tags": [], "extra": {}, "note": None},
+            },
+        }
+
+        fast = store_module._json_dumps(data)
+        monkeypatch.setattr(store_module, "_ORJSON_AVAILABLE", False)
+        fallback = store_module._json_dumps(data)
+
+        assert fast == fallback
+        assert store_module._json_loads(fallback) == data
+
+    def test_update_session_writes_fields(self, store):
+        """_update_session updates current_session and persists it."""
+        store._update_session(session_tokens=25000, tool_failures=3)
+
+        with open(store.state_path) as f:
+            session = json.load(f)["current_session"]
+        assert session["session_tokens"] == 25000
+        assert session["tool_failures"] == 3
 
     def test_memory_file_format(self, store, sample_memory):
         """Verify memory file has correct format."""
@@ -586,13 +943,34 @@ class TestFileOperations:
         assert parsed["difficulty"] == 0.7
         assert parsed["phase"] == 0
 
+    def test_parse_memory_file_cached_copy(self, store):
+        """Repeated parses are served from cache as independent copies."""
+        memory_id = store.create("Topic", "Content", tags=["a"])
+        memory_path = store.memories_path / f"{memory_id}.md"
+
+        first = store._parse_memory_file(memory_path)
+        first["tags"].append("b")
+        first["topic"] = "Changed"
+        second = store._parse_memory_file(memory_path)
+
+        assert second["tags"] == ["a"]
+        assert second["topic"] == "Topic"
+        assert str(memory_path) in store._parse_cache
+
+    def test_parse_memory_file_sees_updates(self, store):
+        """Writing a memory file drops its cached parse."""
+        memory_id = store.create("Topic", "Content")
+        store.read(memory_id, update_stats=False)
+
+        store.update(memory_id, content="Changed")
+
+        assert store.read(memory_id, update_stats=False)["content"] == "Changed"
+
     def test_directories_auto_created(self, temp_ltm_dir):
         """Directories are auto-created if missing."""
-        import shutil
-
-        # Remove directories
-        shutil.rmtree(temp_ltm_dir / "memories", ignore_errors=True)
-        shutil.rmtree(temp_ltm_dir / "archives", ignore_errors=True)
+        # Remove directories (empty in the fixture, so a single rmdir each)
+        (temp_ltm_dir / "memories").rmdir()
+        (temp_ltm_dir / "archives").rmdir()
 
         # Create new store
         store = MemoryStore(base_path=temp_ltm_dir)
@@ -642,13 +1020,25 @@ Content here
         assert parsed["id"] == "test"
         assert parsed["topic"] == "Test topic"
 
+    def test_parse_crlf_file(self, store):
+        """CRLF line endings parse like LF ones."""
+        test_path = store.memories_path / "crlf_test.md"
+        test_path.write_bytes(
+            b'---\r\nid: "test"\r\ntopic: "Test topic"\r\n---\r\nline1\r\nline2'
+        )
+
+        parsed = store._parse_memory_file(test_path)
+
+        assert parsed["topic"] == "Test topic"
+        assert parsed["content"] == "line1\nline2"
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
 
     def test_list_memories_without_stats(self, temp_ltm_dir):
         """List memories when stats.json doesn't have entry for a memory."""
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
 
         # Create a memory
         memory_id = store.create(topic="Test", content="Content")
@@ -657,7 +1047,7 @@ class TestEdgeCases:
         stats = store._read_stats()
         del stats["memories"][memory_id]
         store._write_stats(stats)
-        store.invalidate_cache()
+        store.invalidate_cache("stats")
 
         # List should still work, calculating priority on the fly
         result = store.list()
@@ -668,7 +1058,7 @@ class TestEdgeCases:
 
     def test_search_calculates_priority_when_missing(self, temp_ltm_dir):
         """Search calculates priority when not in stats."""
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
 
         # Create a memory
         memory_id = store.create(topic="Searchable topic", content="Content")
@@ -677,7 +1067,7 @@ class TestEdgeCases:
         stats = store._read_stats()
         del stats["memories"][memory_id]
         store._write_stats(stats)
-        store.invalidate_cache()
+        store.invalidate_cache("stats")
 
         # Search should still work
         result = store.search("searchable")
@@ -688,24 +1078,10 @@ class TestEdgeCases:
     def test_read_existing_index_from_disk(self, temp_ltm_dir):
         """Read index.json that already exists on disk."""
         # Pre-create index.json
-        index_data = {
-            "version": 1,
-            "memories": {
-                "mem_existing": {
-                    "topic": "Existing memory",
-                    "tags": ["test"],
-                    "phase": 0,
-                    "difficulty": 0.5,
-                    "created_at": "2026-01-01T00:00:00Z",
-                }
-            },
-        }
-        index_path = temp_ltm_dir / "index.json"
-        with open(index_path, "w") as f:
-            json.dump(index_data, f)
+        (temp_ltm_dir / "index.json").write_bytes(_EXISTING_INDEX)
 
         # Create store and verify it reads existing index
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         index = store._read_index()
 
         assert "mem_existing" in index["memories"]
@@ -714,19 +1090,10 @@ class TestEdgeCases:
     def test_read_existing_state_from_disk(self, temp_ltm_dir):
         """Read state.json that already exists on disk."""
         # Pre-create state.json
-        state_data = {
-            "version": 1,
-            "session_count": 42,
-            "current_session": {},
-            "compaction_count": 5,
-            "config": {"max_memories": 200},
-        }
-        state_path = temp_ltm_dir / "state.json"
-        with open(state_path, "w") as f:
-            json.dump(state_data, f)
+        (temp_ltm_dir / "state.json").write_bytes(_EXISTING_STATE)
 
         # Create store and verify it reads existing state
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         state = store._read_state()
 
         assert state["session_count"] == 42
@@ -735,18 +1102,9 @@ class TestEdgeCases:
     def test_read_state_merges_session_tokens_default(self, temp_ltm_dir):
         """Existing state without session_tokens gets default merged in."""
         # Pre-create state.json without session_tokens
-        state_data = {
-            "version": 1,
-            "session_count": 10,
-            "current_session": {"tool_failures": 5},
-            "compaction_count": 0,
-            "config": {},
-        }
-        state_path = temp_ltm_dir / "state.json"
-        with open(state_path, "w") as f:
-            json.dump(state_data, f)
+        (temp_ltm_dir / "state.json").write_bytes(_STATE_WITHOUT_SESSION_TOKENS)
 
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         state = store._read_state()
 
         # Should have session_tokens default merged in
@@ -757,18 +1115,9 @@ class TestEdgeCases:
     def test_read_state_merges_token_counting_config(self, temp_ltm_dir):
         """Existing state without token_counting config gets defaults merged."""
         # Pre-create state.json without token_counting
-        state_data = {
-            "version": 1,
-            "session_count": 5,
-            "current_session": {},
-            "compaction_count": 0,
-            "config": {"max_memories": 50},
-        }
-        state_path = temp_ltm_dir / "state.json"
-        with open(state_path, "w") as f:
-            json.dump(state_data, f)
+        (temp_ltm_dir / "state.json").write_bytes(_STATE_WITHOUT_TOKEN_COUNTING)
 
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         state = store._read_state()
 
         # Should have token_counting defaults merged in
@@ -780,7 +1129,7 @@ class TestEdgeCases:
 
     def test_read_state_new_file_has_token_defaults(self, temp_ltm_dir):
         """New state.json includes token counting defaults."""
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         state = store._read_state()
 
         # Check session_tokens default
@@ -793,17 +1142,9 @@ class TestEdgeCases:
     def test_read_state_missing_current_session_key(self, temp_ltm_dir):
         """Existing state without current_session key gets default added."""
         # Pre-create state.json without current_session
-        state_data = {
-            "version": 1,
-            "session_count": 5,
-            "compaction_count": 0,
-            "config": {},
-        }
-        state_path = temp_ltm_dir / "state.json"
-        with open(state_path, "w") as f:
-            json.dump(state_data, f)
+        (temp_ltm_dir / "state.json").write_bytes(_STATE_WITHOUT_CURRENT_SESSION)
 
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         state = store._read_state()
 
         # Should have current_session with session_tokens default
@@ -813,17 +1154,9 @@ class TestEdgeCases:
     def test_read_state_missing_config_key(self, temp_ltm_dir):
         """Existing state without config key gets defaults added."""
         # Pre-create state.json without config
-        state_data = {
-            "version": 1,
-            "session_count": 5,
-            "current_session": {},
-            "compaction_count": 0,
-        }
-        state_path = temp_ltm_dir / "state.json"
-        with open(state_path, "w") as f:
-            json.dump(state_data, f)
+        (temp_ltm_dir / "state.json").write_bytes(_STATE_WITHOUT_CONFIG)
 
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
         state = store._read_state()
 
         # Should have config with token_counting defaults
@@ -831,6 +1164,37 @@ class TestEdgeCases:
         assert "token_counting" in state["config"]
         assert state["config"]["token_counting"]["enabled"] is True
 
+    def test_open_reuses_instance(self, temp_ltm_dir):
+        """open() memoizes stores by resolved path."""
+        store = MemoryStore.open(temp_ltm_dir)
+
+        assert MemoryStore.open(temp_ltm_dir / "memories" / "..") is store
+        assert MemoryStore.open(str(temp_ltm_dir)) is store
+
+    def test_open_drops_unreferenced_stores(self, temp_ltm_dir):
+        """open() does not keep stores alive once callers release them."""
+        import gc
+
+        store = MemoryStore.open(temp_ltm_dir)
+        key = str(temp_ltm_dir.resolve())
+        assert key in MemoryStore._instances
+
+        del store
+        gc.collect()
+        assert key not in MemoryStore._instances
+
+    def test_open_rebuilds_when_directories_removed(self, temp_ltm_dir):
+        """open() constructs a new store if the cached one lost its directories."""
+        import shutil
+
+        store = MemoryStore.open(temp_ltm_dir)
+        shutil.rmtree(temp_ltm_dir / "memories")
+
+        reopened = MemoryStore.open(temp_ltm_dir)
+
+        assert reopened is not store
+        assert reopened.memories_path.is_dir()
+
     def test_write_state(self, store):
         """Test _write_state method."""
         new_state = {
@@ -842,7 +1206,7 @@ class TestEdgeCases:
         }
 
         store._write_state(new_state)
-        store.invalidate_cache()
+        store.invalidate_cache("state")
 
         # Read back and verify
         state = store._read_state()
@@ -851,7 +1215,7 @@ class TestEdgeCases:
 
     def test_search_missing_memory_file(self, temp_ltm_dir):
         """Search handles case where index references non-existent file."""
-        store = MemoryStore(base_path=temp_ltm_dir)
+        store = MemoryStore.open(temp_ltm_dir)
 
         # Create a memory
         memory_id = store.create(topic="Test topic", content="Test content")
@@ -879,6 +1243,16 @@ class TestEdgeCases:
         assert len(result[0]["summary"]) == 203  # 200 chars + "..."
         assert result[0]["summary"].endswith("...")
 
+    def test_large_unicode_memory_round_trip(self, temp_ltm_dir):
+        """Memory files larger than one read chunk round-trip intact."""
+        store = MemoryStore(base_path=temp_ltm_dir)
+        content = "caf\u00e9 \u65e5\u672c " * 20000  # well over 64 KiB
+
+        memory_id = store.create(topic="Large", content=content)
+        store.invalidate_cache()
+
+        assert store.read(memory_id)["content"] == content.strip()
+
     def test_parse_yaml_with_quoted_list_items(self, store):
         """Parse YAML with quoted list items."""
         test_path = store.memories_path / "quoted_list_test.md"
@@ -926,11 +1300,13 @@ Content here
 
         assert store.base_path == ltm_path
 
-    def test_atomic_write_json_failure_cleanup(self, store, monkeypatch):
+    def test_atomic_write_json_failure_cleanup(self, temp_ltm_dir, monkeypatch):
         """Test that atomic write cleans up temp file on failure."""
         import os
         import tempfile
 
+        store = MemoryStore(base_path=temp_ltm_dir)
+
         temp_files_created = []
         original_mkstemp = tempfile.mkstemp
 
@@ -939,11 +1315,11 @@ Content here
             temp_files_created.append(path)
             return fd, path
 
-        def failing_rename(src, dst):
-            raise OSError("Simulated rename failure")
+        def failing_replace(src, dst):
+            raise OSError("Simulated replace failure")
 
         monkeypatch.setattr(tempfile, "mkstemp", tracking_mkstemp)
-        monkeypatch.setattr(os, "rename", failing_rename)
+        monkeypatch.setattr(os, "replace", failing_replace)
 
         test_path = store.base_path / "fail_test.json"
 
@@ -954,11 +1330,13 @@ Content here
         for temp_file in temp_files_created:
             assert not os.path.exists(temp_file)
 
-    def test_write_memory_file_failure_cleanup(self, store, monkeypatch):
+    def test_write_memory_file_failure_cleanup(self, temp_ltm_dir, monkeypatch):
         """Test that memory file write cleans up temp file on failure."""
         import os
         import tempfile
 
+        store = MemoryStore(base_path=temp_ltm_dir)
+
         temp_files_created = []
         original_mkstemp = tempfile.mkstemp
 
@@ -967,11 +1345,11 @@ Content here
             temp_files_created.append(path)
             return fd, path
 
-        def failing_rename(src, dst):
-            raise OSError("Simulated rename failure")
+        def failing_replace(src, dst):
+            raise OSError("Simulated replace failure")
 
         monkeypatch.setattr(tempfile, "mkstemp", tracking_mkstemp)
-        monkeypatch.setattr(os, "rename", failing_rename)
+        monkeypatch.setattr(os, "replace", failing_replace)
 
         with pytest.raises(OSError):
             store._write_memory_file(
@@ -994,6 +1372,37 @@ Content here
         assert store.base_path == tmp_path
 
 
+class TestPriorityColumns:
+    """Tests for the column view used by batch priority calculation."""
+
+    def test_columns_match_index_and_stats(self, populated_store):
+        """Columns mirror difficulty, access_count and last_session."""
+        ids, difficulty, access_count, last_session = (
+            populated_store._priority_columns()
+        )
+
+        index = populated_store._read_index()["memories"]
+        stats = populated_store._read_stats()["memories"]
+        assert ids == list(index)
+        assert difficulty == [index[i]["difficulty"] for i in ids]
+        assert access_count == [stats[i]["access_count"] for i in ids]
+        assert last_session == [stats[i]["last_session"] for i in ids]
+
+    def test_columns_stay_in_sync(self, store):
+        """Columns reflect creates, reads and deletes."""
+        first = store.create(topic="First", content="Content", difficulty=0.2)
+        second = store.create(topic="Second", content="Content", difficulty=0.9)
+        assert store._priority_columns()[0] == [first, second]
+
+        store.read(first)
+        ids, difficulty, access_count, _ = store._priority_columns()
+        assert difficulty == [0.2, 0.9]
+        assert access_count == [1, 0]
+
+        store.delete(first)
+        assert store._priority_columns()[0] == [second]
+
+
 class TestIntegrityCheck:
     """Tests for integrity check functionality."""
 
@@ -1023,6 +1432,45 @@ class TestIntegrityCheck:
         assert result["is_healthy"] is False
         assert "orphan_mem" in result["orphaned_files"]
 
+    def test_check_integrity_ignores_md_directories(self, store):
+        """Only files count as memory files."""
+        (store.memories_path / "not_a_memory.md").mkdir()
+
+        result = store.check_integrity()
+
+        assert result["orphaned_files"] == []
+        assert result["is_healthy"] is True
+
+    def test_check_integrity_does_not_parse_files(self, store, monkeypatch):
+        """check_integrity works from file names without reading any file."""
+        store.create(topic="Topic", content="Content")
+        (store.memories_path / "mem_orphan.md").write_text("not frontmatter")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("memory file parsed")
+
+        monkeypatch.setattr(store, "_parse_memory_file", fail)
+        monkeypatch.setattr(store, "_parse_memory_text", fail)
+
+        issues = store.check_integrity()
+        assert issues["orphaned_files"] == ["mem_orphan"]
+
+    def test_list_ids_cached_until_directory_changes(self, store):
+        """Directory listings are reused until the directory mtime changes."""
+        import os
+
+        (store.memories_path / "mem_a.md").write_text("a")
+        # Age the directory so its listing is eligible for caching
+        os.utime(store.memories_path, ns=(10**18, 10**18))
+
+        first = store._list_ids(store.memories_path)
+        assert first == {"mem_a"}
+        assert store._list_ids(store.memories_path) is first
+
+        (store.memories_path / "mem_b.md").write_text("b")
+
+        assert store._list_ids(store.memories_path) == {"mem_a", "mem_b"}
+
     def test_check_integrity_missing_file(self, store):
         """Check integrity detects missing memory files."""
         # Create index entry without file
@@ -1088,6 +1536,15 @@ class TestIntegrityCheck:
         assert "missing_file" in result["missing_files"]
         assert "orphan_stats" in result["orphaned_stats"]
 
+    def test_check_integrity_lists_sorted(self, store):
+        """Check integrity reports IDs in sorted order."""
+        for name in ("mem_c", "mem_a", "mem_b"):
+            (store.memories_path / f"{name}.md").write_text("Content")
+
+        result = store.check_integrity()
+
+        assert result["orphaned_files"] == ["mem_a", "mem_b", "mem_c"]
+
 
 class TestIntegrityFix:
     """Tests for integrity fix functionality."""
@@ -1215,15 +1672,15 @@ class TestIntegrityFix:
         orphan_path = store.memories_path / "orphan_mem.md"
         orphan_path.write_text("---\nid: orphan_mem\n---\nContent")
 
-        # Make shutil.copy2 raise an exception
+        # Make both hard linking and copying raise an exception
+        import os
         import shutil
 
-        original_copy2 = shutil.copy2
+        def failing_archive(src, dst):
+            raise PermissionError("Cannot archive file")
 
-        def failing_copy2(src, dst):
-            raise PermissionError("Cannot copy file")
-
-        monkeypatch.setattr(shutil, "copy2", failing_copy2)
+        monkeypatch.setattr(os, "link", failing_archive)
+        monkeypatch.setattr(shutil, "copyfile", failing_archive)
 
         result = store.fix_integrity(archive_orphans=True)
 
@@ -1233,6 +1690,26 @@ class TestIntegrityFix:
         assert result["removed_files"] == 1
         assert not orphan_path.exists()
 
+    def test_fix_integrity_archive_copies_when_link_fails(self, store, monkeypatch):
+        """fix_integrity copies the orphan when it cannot be hard linked."""
+        orphan_path = store.memories_path / "orphan_mem.md"
+        orphan_path.write_text("---\nid: orphan_mem\n---\nContent")
+
+        import os
+
+        def failing_link(src, dst):
+            raise OSError("Cross-device link")
+
+        monkeypatch.setattr(os, "link", failing_link)
+
+        result = store.fix_integrity(archive_orphans=True)
+
+        assert result["archived_files"] == 1
+        assert result["removed_files"] == 1
+        assert not orphan_path.exists()
+        archive_path = store.archives_path / "orphan_mem.md"
+        assert archive_path.read_text() == "---\nid: orphan_mem\n---\nContent"
+
     def test_fix_integrity_remove_exception(self, store, monkeypatch):
         """fix_integrity handles exception during file removal gracefully."""
         # Create orphaned file
@@ -1293,6 +1770,22 @@ class TestIntegrityFix:
         for i in range(3):
             assert not (store.archives_path / f"orphan_{i}.md").exists()
 
+    def test_fix_integrity_removes_large_batches_in_parallel(self, store, monkeypatch):
+        """fix_integrity removes batches past PARALLEL_UNLINK_MIN on threads."""
+        monkeypatch.setattr(MemoryStore, "PARALLEL_UNLINK_MIN", 2)
+        for i in range(5):
+            (store.memories_path / f"orphan_{i}.md").write_text(f"Content {i}")
+            (store.archives_path / f"stale_{i}.md").write_text(f"Content {i}")
+
+        result = store.fix_integrity(
+            archive_orphans=False, clean_orphaned_archives=True
+        )
+
+        assert result["removed_files"] == 5
+        assert result["removed_orphaned_archives"] == 5
+        assert not any(store.memories_path.iterdir())
+        assert not any(store.archives_path.iterdir())
+
     def test_fix_integrity_clean_orphaned_archives_exception(self, store, monkeypatch):
         """fix_integrity handles exception during archive removal gracefully."""
         # Create orphaned archive file
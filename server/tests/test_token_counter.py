@@ -8,15 +8,32 @@ Test cases from Test Plan (docs/TEST_PLAN_TOKEN_COUNTING.md):
 
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # Add server directory to path for imports
 # tests are at: server/tests/ -> go up one level to server/
 _server_path = Path(__file__).parent.parent
 sys.path.insert(0, str(_server_path))
 
+from token_counter import TokenCounter
+
+
+@pytest.fixture(autouse=True)
+def _local_tokenizer_cache(tmp_path, monkeypatch):
+    """Keep local tokenizer copies saved by tests out of the user's cache."""
+    monkeypatch.setenv("LTM_TOKENIZER_CACHE", str(tmp_path / "tokenizers"))
+
+
+@pytest.fixture(scope="module")
+def counter():
+    """Default TokenCounter shared by tests that only query it."""
+    return TokenCounter()
+
 
 # =============================================================================
 # TC-01 to TC-08: TokenCounter Class Tests
@@ -26,17 +43,12 @@ sys.path.insert(0, str(_server_path))
 class TestTokenCounterEnabled:
     """Tests for TokenCounter enabled/disabled states."""
 
-    def test_always_enabled_by_default(self):
+    def test_always_enabled_by_default(self, counter):
         """TC-01: TokenCounter is always enabled by default (no credentials needed)."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.is_enabled() is True
 
     def test_disabled_via_config(self):
         """TC-02: Disabled via config returns 0."""
-        from token_counter import TokenCounter
-
         config = {"token_counting": {"enabled": False}}
         counter = TokenCounter(config)
         assert counter.is_enabled() is False
@@ -46,34 +58,32 @@ class TestTokenCounterEnabled:
 class TestTokenCounterCounting:
     """Tests for token counting behavior."""
 
-    def test_count_returns_integer(self):
+    def test_count_returns_integer(self, counter):
         """TC-03: Count returns integer >= 1 for non-empty text."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         result = counter.count_tokens("Hello world")
         assert isinstance(result, int)
         assert result >= 1
 
-    def test_empty_string_returns_zero(self):
+    def test_empty_string_returns_zero(self, counter):
         """TC-04: Empty string returns 0."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.count_tokens("") == 0
 
-    def test_none_returns_zero(self):
+    def test_none_returns_zero(self, counter):
         """TC-05: None returns 0."""
-        from token_counter import TokenCounter
+        assert counter.count_tokens(None) == 0
 
+    def test_non_string_returns_zero(self):
+        """Non-string input returns 0 without reaching the tokenizer."""
         counter = TokenCounter()
-        assert counter.count_tokens(None) == 0
+        counter._tokenizer = MagicMock()
+        counter._tokenizer.backend_tokenizer.encode_batch.return_value = [[1, 2]]
 
-    def test_deterministic_counting(self):
-        """TC-06: Same input always produces same output."""
-        from token_counter import TokenCounter
+        assert counter.count_tokens(["Hello"]) == 0
+        assert counter.count_tokens_batch([42, "Hi"]) == [0, 2]
+        counter._tokenizer.backend_tokenizer.encode.assert_not_called()
 
-        counter = TokenCounter()
+    def test_deterministic_counting(self, counter):
+        """TC-06: Same input always produces same output."""
         text = "The quick brown fox jumps over the lazy dog."
         result1 = counter.count_tokens(text)
         result2 = counter.count_tokens(text)
@@ -82,8 +92,6 @@ class TestTokenCounterCounting:
 
     def test_config_normalize_cap(self):
         """TC-07: Config normalize_cap affects normalization."""
-        from token_counter import TokenCounter
-
         config = {"token_counting": {"normalize_cap": 50000}}
         counter = TokenCounter(config)
         # 50000 tokens with cap of 50000 should give 1.0
@@ -93,13 +101,14 @@ class TestTokenCounterCounting:
 
     def test_tokenizer_error_returns_zero(self):
         """TC-08: Tokenizer error returns 0 and logs warning."""
-        from token_counter import TokenCounter
-
         counter = TokenCounter()
         # Force an error by corrupting the tokenizer
         original_tokenizer = counter._tokenizer
         counter._tokenizer = MagicMock()
         counter._tokenizer.encode.side_effect = Exception("Tokenizer error")
+        counter._tokenizer.backend_tokenizer.encode.side_effect = Exception(
+            "Tokenizer error"
+        )
 
         result = counter.count_tokens("Hello world")
         assert result == 0
@@ -107,6 +116,171 @@ class TestTokenCounterCounting:
         # Restore the tokenizer
         counter._tokenizer = original_tokenizer
 
+    def test_count_uses_backend_encoding_length(self):
+        """Counting takes the length of the backend encoding."""
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        counter._enabled = True
+        counter._tokenizer = MagicMock()
+        counter._tokenizer.backend_tokenizer.encode.return_value = [7, 8]
+
+        assert counter.count_tokens("Hello world") == 2
+        counter._tokenizer.backend_tokenizer.encode.assert_called_once_with(
+            "Hello world", add_special_tokens=False
+        )
+        counter._tokenizer.encode.assert_not_called()
+
+    def test_char_fallback_matches_float_estimate(self):
+        """Char fallback equals int(len / 3.5), including at multiples of 7."""
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        counter._enabled = True
+        counter._use_char_fallback = True
+
+        for length in (1, 3, 4, 6, 7, 8, 14, 100, 349, 350, 10**6):
+            assert counter.count_tokens("x" * length) == int(length / 3.5)
+
+    def test_estimate_short_text(self):
+        """Opted-in short ASCII texts are estimated without the tokenizer."""
+        counter = TokenCounter({"token_counting": {"estimate_short_text": True}})
+        counter._tokenizer = MagicMock()
+        encode = counter._tokenizer.backend_tokenizer.encode
+        encode.return_value = [1, 2, 3]
+
+        assert counter.count_tokens("Hi") == 1
+        assert counter.count_tokens("Hello wo") == 2
+        encode.assert_not_called()
+
+        assert counter.count_tokens("Hello world") == 3  # too long
+        assert counter.count_tokens("日本語") == 3  # not ASCII
+        assert encode.call_count == 2
+
+    def test_estimate_whitespace_only_text(self):
+        """Opted-in whitespace-only texts of any length skip the tokenizer."""
+        counter = TokenCounter({"token_counting": {"estimate_short_text": True}})
+        counter._tokenizer = MagicMock()
+        encode = counter._tokenizer.backend_tokenizer.encode
+        encode.return_value = [1, 2, 3]
+
+        assert counter.count_tokens("\n" * 400) == 100
+        assert counter.count_tokens(" \t\n" * 100) == 75
+        encode.assert_not_called()
+
+        assert counter.count_tokens("\n" * 400 + ".") == 3
+        assert encode.call_count == 1
+
+    def test_short_text_tokenized_by_default(self):
+        """Without the option, short texts still go to the tokenizer."""
+        counter = TokenCounter()
+        counter._tokenizer = MagicMock()
+        counter._tokenizer.backend_tokenizer.encode.return_value = [1, 2, 3]
+
+        assert counter.count_tokens("Hi") == 3
+
+    def test_approximate_mode_uses_byte_length(self):
+        """Approximate mode divides UTF-8 length by bytes_per_token."""
+        config = {"token_counting": {"approximate": True, "bytes_per_token": 4}}
+        with patch.object(TokenCounter, "_initialize") as initialize:
+            counter = TokenCounter(config)
+            assert counter.count_tokens("x" * 40) == 10
+            assert counter.count_tokens("\u00e9" * 10) == 5  # 2 bytes each
+            assert counter.count_tokens_batch(["x" * 8, None]) == [2, 0]
+            assert counter.using_char_fallback is True
+            initialize.assert_not_called()
+
+    @pytest.mark.parametrize("bytes_per_token", [0, -2, "many", None])
+    def test_invalid_bytes_per_token_uses_default(self, bytes_per_token):
+        """Non-positive or non-numeric bytes_per_token falls back to 3.7."""
+        config = {
+            "token_counting": {"approximate": True, "bytes_per_token": bytes_per_token}
+        }
+        counter = TokenCounter(config)
+        assert counter._bytes_per_token == TokenCounter.DEFAULT_BYTES_PER_TOKEN
+        assert counter.count_tokens("x" * 37) == 10
+
+    def test_count_cache_reuses_counts(self, monkeypatch):
+        """Repeated long texts are tokenized once; the cache is LRU-bounded."""
+        monkeypatch.setattr(TokenCounter, "COUNT_CACHE_SIZE", 2)
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        counter._enabled = True
+        counter._tokenizer = MagicMock()
+        encode = counter._tokenizer.backend_tokenizer.encode
+        encode.side_effect = lambda text, **kwargs: text.split()
+
+        first, second, third = (f"word {i} " * 20 for i in range(3))
+        assert counter.count_tokens(first) == 40
+        assert counter.count_tokens(first) == 40
+        assert encode.call_count == 1
+
+        counter.count_tokens(second)
+        counter.count_tokens(third)  # evicts first
+        counter.count_tokens(first)
+        assert encode.call_count == 4
+
+        counter.clear_cache()
+        counter.count_tokens(first)
+        assert encode.call_count == 5
+
+    def test_count_cache_keys(self):
+        """Medium texts are cached under themselves, long ones by digest."""
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        counter._enabled = True
+        counter._tokenizer = MagicMock()
+        backend = counter._tokenizer.backend_tokenizer
+        backend.encode.side_effect = lambda text, **kwargs: text.split()
+
+        medium = "word " * 10
+        long_text = "word " * 100
+        counter.count_tokens(medium)
+        counter.count_tokens(long_text)
+
+        keys = list(counter._count_cache)
+        assert keys[0] == medium
+        assert isinstance(keys[1], bytes)
+
+    def test_count_batch_matches_single(self, counter):
+        """Batch counting gives the same counts as counting one by one."""
+        texts = ["Hello world", "", None, "def f():\n    return 1\n" * 20]
+
+        assert counter.count_tokens_batch(texts) == [
+            counter.count_tokens(text) for text in texts
+        ]
+
+    def test_count_batch_single_backend_call(self):
+        """Batch counting encodes all non-empty texts in one backend call."""
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        counter._enabled = True
+        counter._tokenizer = MagicMock()
+        backend = counter._tokenizer.backend_tokenizer
+        # Stand-ins for tokenizers.Encoding, which supports len()
+        backend.encode_batch.return_value = [[1, 2, 3], [4]]
+
+        assert counter.count_tokens_batch(["a b c", "", "d"]) == [3, 0, 1]
+        backend.encode_batch.assert_called_once_with(
+            ["a b c", "d"], add_special_tokens=False
+        )
+
+    def test_count_batch_uses_count_cache(self):
+        """Batch counting reuses and fills the count cache and estimates."""
+        counter = TokenCounter({"token_counting": {"estimate_short_text": True}})
+        counter._tokenizer = MagicMock()
+        backend = counter._tokenizer.backend_tokenizer
+        backend.encode.side_effect = lambda text, **kwargs: text.split()
+        backend.encode_batch.side_effect = lambda texts, **kwargs: [t.split() for t in texts]
+
+        known, fresh = "word " * 20, "other " * 10
+        assert counter.count_tokens(known) == 20
+
+        assert counter.count_tokens_batch([known, "Hi", fresh]) == [20, 1, 10]
+        backend.encode_batch.assert_called_once_with(
+            [fresh], add_special_tokens=False
+        )
+
+        assert counter.count_tokens(fresh) == 10
+        assert backend.encode.call_count == 1
+
+    def test_count_batch_disabled_returns_zeros(self):
+        """Batch counting returns zeros when disabled."""
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        assert counter.count_tokens_batch(["Hello", "world"]) == [0, 0]
 
 # =============================================================================
 # TC-10 to TC-15: Normalization Tests
@@ -116,49 +290,59 @@ class TestTokenCounterCounting:
 class TestTokenNormalization:
     """Tests for token count normalization."""
 
-    def test_half_of_cap(self):
+    def test_half_of_cap(self, counter):
         """TC-10: Half of cap gives 0.5."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()  # Default cap is 100000
         assert counter.normalize(50000) == 0.5
 
-    def test_at_cap(self):
+    def test_at_cap(self, counter):
         """TC-11: At cap gives 1.0."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.normalize(100000) == 1.0
 
-    def test_above_cap(self):
+    def test_above_cap(self, counter):
         """TC-12: Above cap gives 1.0 (capped)."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.normalize(200000) == 1.0
 
-    def test_zero_tokens(self):
+    def test_zero_tokens(self, counter):
         """TC-13: Zero tokens gives 0.0."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.normalize(0) == 0.0
 
     def test_custom_cap(self):
         """TC-14: Custom cap in config works correctly."""
-        from token_counter import TokenCounter
-
         config = {"token_counting": {"normalize_cap": 50000}}
         counter = TokenCounter(config)
         assert counter.normalize(25000) == 0.5
 
-    def test_negative_tokens_normalize(self):
+    def test_negative_tokens_normalize(self, counter):
         """TC-15: Negative token count normalizes to 0.0."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.normalize(-100) == 0.0
 
+    def test_score_matches_normalized_count(self):
+        """score() equals normalize(count_tokens()) for ordinary texts."""
+        config = {"token_counting": {"normalize_cap": 10}}
+        counter = TokenCounter(config)
+        counter._tokenizer = MagicMock()
+        counter._tokenizer.get_vocab.return_value = {"a": 0, "abcd": 1}
+        backend = counter._tokenizer.backend_tokenizer
+        backend.encode.side_effect = lambda text, **kwargs: text.split()
+
+        assert counter.score("one two three four five") == 0.5
+        assert counter.score("") == 0.0
+
+    def test_score_skips_tokenizer_for_saturated_texts(self):
+        """Texts long enough to reach the cap score 1.0 without encoding."""
+        config = {"token_counting": {"normalize_cap": 10}}
+        counter = TokenCounter(config)
+        counter._tokenizer = MagicMock()
+        counter._tokenizer.get_vocab.return_value = {"a": 0, "abcd": 1}
+        encode = counter._tokenizer.backend_tokenizer.encode
+
+        assert counter.score("x" * 40) == 1.0  # >= 10 tokens of <= 4 bytes
+        encode.assert_not_called()
+
+        encode.return_value = [1] * 5
+        assert counter.score("x" * 39) == 0.5
+        encode.assert_called_once()
+
 
 # =============================================================================
 # TC-60 to TC-63: Real Tokenizer Tests
@@ -168,28 +352,19 @@ class TestTokenNormalization:
 class TestRealTokenizer:
     """Tests using the real tokenizer (not mocked)."""
 
-    def test_simple_text(self):
+    def test_simple_text(self, counter):
         """TC-60: Simple text produces token count > 0."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.is_enabled() is True
         result = counter.count_tokens("Hello world")
         assert result > 0
 
-    def test_unicode_text(self):
+    def test_unicode_text(self, counter):
         """TC-61: Unicode text is tokenized correctly."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         result = counter.count_tokens("中文 emoji 日本語")
         assert result > 0
 
-    def test_long_text(self):
+    def test_long_text(self, counter):
         """TC-62: Long text produces proportionally more tokens."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         short_text = "Hello world"
         long_text = short_text * 100
 
@@ -199,11 +374,8 @@ class TestRealTokenizer:
         # Long text should have significantly more tokens
         assert long_count > short_count * 50  # At least 50x more
 
-    def test_whitespace_only(self):
+    def test_whitespace_only(self, counter):
         """TC-63: Whitespace-only text is handled."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         result = counter.count_tokens("   \n\t  ")
         # May return 0 or small number depending on tokenizer
         assert result >= 0
@@ -217,17 +389,21 @@ class TestRealTokenizer:
 class TestTokenCounterProperties:
     """Tests for TokenCounter properties."""
 
-    def test_default_normalize_cap(self):
+    def test_default_normalize_cap(self, counter):
         """Default normalize_cap is 100000."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         assert counter.normalize_cap == 100000
 
+    def test_normalize_cap_resolved_at_construction(self):
+        """normalize() uses the cap read once in __init__, not the config."""
+        config = {"token_counting": {"normalize_cap": 50000}}
+        counter = TokenCounter(config)
+        config["token_counting"]["normalize_cap"] = 1
+
+        assert counter.normalize_cap == 50000
+        assert counter.normalize(25000) == 0.5
+
     def test_is_enabled_with_none_config(self):
         """TokenCounter works with None config."""
-        from token_counter import TokenCounter
-
         counter = TokenCounter(None)
         assert counter.is_enabled() is True
 
@@ -237,27 +413,33 @@ class TestTokenCounterInitialization:
 
     def test_tokenizer_import_error_falls_back_to_char(self):
         """Falls back to char-based estimation when transformers not installed."""
-        from token_counter import TokenCounter
-
         # Create a TokenCounter instance and manually test initialization
         counter = TokenCounter.__new__(TokenCounter)
-        counter._config = {}
+        counter._tc_config = {}
         counter._tokenizer = None
         counter._use_char_fallback = False
 
-        # Simulate _TRANSFORMERS_AVAILABLE = False
-        with patch("token_counter._TRANSFORMERS_AVAILABLE", False):
+        # Simulate neither tokenizers nor transformers being installed
+        with patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", False):
             result = counter._initialize()
             assert result is True
             assert counter._tokenizer is None
             assert counter._use_char_fallback is True
 
+    def test_no_tokenizer_library_still_scores(self):
+        """Without any tokenizer library, counts and scores stay non-zero."""
+        with patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", False):
+            counter = TokenCounter({"token_counting": {"normalize_cap": 100}})
+            assert counter.count_tokens("x" * 70) == 20
+            assert counter.score("x" * 70) == 0.2
+            assert counter.using_char_fallback is True
+
     def test_tokenizer_load_failure_falls_back_to_char(self):
         """Falls back to char-based estimation when tokenizer cannot load."""
-        from token_counter import TokenCounter
-
         counter = TokenCounter.__new__(TokenCounter)
-        counter._config = {}
+        counter._tc_config = {}
         counter._tokenizer = None
         counter._use_char_fallback = False
 
@@ -267,16 +449,199 @@ class TestTokenCounterInitialization:
             "Failed to load tokenizer"
         )
 
-        with patch("token_counter._TRANSFORMERS_AVAILABLE", True):
-            with patch("token_counter.GPT2TokenizerFast", mock_transformers.GPT2TokenizerFast):
-                result = counter._initialize()
-                assert result is True
-                assert counter._use_char_fallback is True
+        # Bypass tokenizers already loaded by other tests
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True):
+            with patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                    patch("token_counter._TRANSFORMERS_AVAILABLE", True):
+                with patch(
+                    "token_counter.GPT2TokenizerFast",
+                    mock_transformers.GPT2TokenizerFast,
+                    create=True,
+                ):
+                    result = counter._initialize()
+                    assert result is True
+                    assert counter._use_char_fallback is True
+
+    def test_tokenizer_loaded_once_per_process(self):
+        """Instances share one loaded tokenizer until the cache is reset."""
+        mock_tokenizer_cls = MagicMock()
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.GPT2TokenizerFast", mock_tokenizer_cls, create=True):
+            first = TokenCounter()
+            second = TokenCounter()
+            first.count_tokens("Hello")
+            second.count_tokens("Hello")
+            assert first._tokenizer is second._tokenizer
+            assert mock_tokenizer_cls.from_pretrained.call_count == 1
+
+            TokenCounter.reset_cache()
+            TokenCounter().count_tokens("Hello")
+            assert mock_tokenizer_cls.from_pretrained.call_count == 2
+
+    def test_loaded_tokenizer_stripped_for_counting(self):
+        """The loaded tokenizer drops its post-processor and decoder."""
+        mock_tokenizer_cls = MagicMock()
+        backend = mock_tokenizer_cls.from_pretrained.return_value.backend_tokenizer
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.GPT2TokenizerFast", mock_tokenizer_cls, create=True):
+            TokenCounter().count_tokens("Hello")
+
+        assert backend.post_processor is None
+        assert backend.decoder is None
+
+    def test_tokenizers_preferred_over_transformers(self):
+        """The Rust tokenizer is loaded directly when tokenizers is installed."""
+        mock_tokenizer_cls = MagicMock()
+        mock_wrapper_cls = MagicMock()
+        tokenizer = mock_tokenizer_cls.from_pretrained.return_value
+        del tokenizer.backend_tokenizer  # tokenizers.Tokenizer has none
+        tokenizer.encode.return_value = [1, 2]
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", True), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.Tokenizer", mock_tokenizer_cls, create=True), \
+                patch("token_counter.GPT2TokenizerFast", mock_wrapper_cls, create=True):
+            assert TokenCounter().count_tokens("Hello") == 2
+
+        mock_tokenizer_cls.from_pretrained.assert_called_once_with(
+            TokenCounter.TOKENIZER_NAME
+        )
+        mock_wrapper_cls.from_pretrained.assert_not_called()
+
+    def test_preload_loads_in_background(self):
+        """preload() loads the tokenizer once on a background thread."""
+        mock_tokenizer_cls = MagicMock()
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.GPT2TokenizerFast", mock_tokenizer_cls, create=True):
+            counter = TokenCounter()
+            counter.preload().join()
+            counter.count_tokens("Hello")
+
+        mock_tokenizer_cls.from_pretrained.assert_called_once()
+        assert counter._tokenizer is mock_tokenizer_cls.from_pretrained.return_value
+
+    def test_preload_disabled_is_noop(self):
+        """preload() starts nothing when counting is disabled."""
+        counter = TokenCounter({"token_counting": {"enabled": False}})
+        assert counter.preload() is None
+
+    def test_concurrent_first_use_loads_once(self):
+        """Counters starting up on several threads share a single load."""
+        import threading
+
+        mock_tokenizer_cls = MagicMock()
+        counters = [TokenCounter() for _ in range(4)]
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.GPT2TokenizerFast", mock_tokenizer_cls, create=True):
+            threads = [
+                threading.Thread(target=counter.count_tokens, args=("Hello",))
+                for counter in counters
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_tokenizer_cls.from_pretrained.assert_called_once()
+        assert all(c._tokenizer is counters[0]._tokenizer for c in counters)
+
+    def test_tokenizer_warmed_up_once_on_load(self):
+        """A freshly loaded tokenizer encodes a warmup text before caching."""
+        mock_tokenizer_cls = MagicMock()
+        loaded = mock_tokenizer_cls.from_pretrained.return_value
+        encode = loaded.backend_tokenizer.encode
+        encode.side_effect = lambda text, **kwargs: text.split()
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.GPT2TokenizerFast", mock_tokenizer_cls, create=True):
+            TokenCounter().count_tokens("Hello world")
+            TokenCounter().count_tokens("Hello world")
+
+        assert [c.args[0] for c in encode.call_args_list] == [
+            "warmup", "Hello world", "Hello world"
+        ]
+
+    def test_tokenizer_saved_and_reloaded_locally(self, tmp_path, monkeypatch):
+        """A downloaded tokenizer is saved and later loaded from disk."""
+        monkeypatch.setenv("LTM_TOKENIZER_CACHE", str(tmp_path))
+        mock_tokenizer_cls = MagicMock()
+        downloaded = mock_tokenizer_cls.from_pretrained.return_value
+        downloaded.save.side_effect = (
+            lambda path: Path(path).write_text("{}")
+        )
+        local_path = tmp_path / "Xenova--claude-tokenizer.json"
+
+        with patch("token_counter._TOKENIZERS_AVAILABLE", True), \
+                patch("token_counter.Tokenizer", mock_tokenizer_cls, create=True):
+            with patch.dict("token_counter._TOKENIZER_CACHE", clear=True):
+                TokenCounter().count_tokens("Hello")
+            assert local_path.read_text() == "{}"
+            assert list(tmp_path.iterdir()) == [local_path]
+
+            with patch.dict("token_counter._TOKENIZER_CACHE", clear=True):
+                TokenCounter().count_tokens("Hello")
+
+        mock_tokenizer_cls.from_pretrained.assert_called_once()
+        mock_tokenizer_cls.from_file.assert_called_once_with(str(local_path))
+
+    def test_tokenizer_loads_without_home_directory(self, monkeypatch):
+        """An unresolvable cache dir skips the local copy, not the tokenizer."""
+        monkeypatch.delenv("LTM_TOKENIZER_CACHE")
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+
+        def no_home():
+            raise RuntimeError("Could not determine home directory.")
+
+        monkeypatch.setattr(Path, "home", no_home)
+        mock_tokenizer_cls = MagicMock()
+        downloaded = mock_tokenizer_cls.from_pretrained.return_value
+        encode = downloaded.backend_tokenizer.encode
+        encode.side_effect = lambda text, **kwargs: text.split()
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", True), \
+                patch("token_counter.Tokenizer", mock_tokenizer_cls, create=True):
+            counter = TokenCounter()
+            assert counter.count_tokens("Hello world") == 2
+            assert counter.using_char_fallback is False
+
+        mock_tokenizer_cls.from_pretrained.assert_called_once()
+        mock_tokenizer_cls.from_file.assert_not_called()
+        downloaded.save.assert_not_called()
+
+    def test_tokenizer_loaded_on_first_count(self):
+        """Constructing a counter does not load the tokenizer."""
+        mock_tokenizer_cls = MagicMock()
+
+        with patch.dict("token_counter._TOKENIZER_CACHE", clear=True), \
+                patch("token_counter._TOKENIZERS_AVAILABLE", False), \
+                patch("token_counter._TRANSFORMERS_AVAILABLE", True), \
+                patch("token_counter.GPT2TokenizerFast", mock_tokenizer_cls, create=True):
+            counter = TokenCounter()
+            assert counter.is_enabled() is True
+            assert counter.normalize(50000) == 0.5
+            mock_tokenizer_cls.from_pretrained.assert_not_called()
+
+            counter.count_tokens("Hello")
+            mock_tokenizer_cls.from_pretrained.assert_called_once()
 
     def test_initialization_with_empty_config(self):
         """TokenCounter initializes with empty config."""
-        from token_counter import TokenCounter
-
         counter = TokenCounter({})
         assert counter.is_enabled() is True
 
@@ -284,30 +649,21 @@ class TestTokenCounterInitialization:
 class TestTokenCounterEdgeCases:
     """Edge case tests for TokenCounter."""
 
-    def test_very_long_text(self):
+    def test_very_long_text(self, counter):
         """Handle very long text without crashing."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         # 100KB of text
         long_text = "word " * 20000
         result = counter.count_tokens(long_text)
         assert result > 0
 
-    def test_special_characters(self):
+    def test_special_characters(self, counter):
         """Handle special characters."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         text = "Special chars: @#$%^&*(){}[]|\\:\";<>?,./~`"
         result = counter.count_tokens(text)
         assert result > 0
 
-    def test_mixed_content(self):
+    def test_mixed_content(self, counter):
         """Handle mixed content (code, text, unicode)."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         text = """
         def hello():
             print("Hello, 世界!")
@@ -318,11 +674,63 @@ class TestTokenCounterEdgeCases:
         result = counter.count_tokens(text)
         assert result > 0
 
-    def test_newlines_and_formatting(self):
+    def test_newlines_and_formatting(self, counter):
         """Handle text with newlines and formatting."""
-        from token_counter import TokenCounter
-
-        counter = TokenCounter()
         text = "Line 1\nLine 2\n\nLine 4\t\tTabbed"
         result = counter.count_tokens(text)
         assert result > 0
+
+
+def _rayon_threads_after_import(monkeypatch, tokenizers_found: bool) -> str | None:
+    """Reimport token_counter with RAYON_NUM_THREADS unset; return its value."""
+    import importlib
+    import token_counter
+
+    find_spec = importlib.util.find_spec
+
+    def fake_find_spec(name, *args):
+        if name == "tokenizers":
+            return object() if tokenizers_found else None
+        return find_spec(name, *args)
+
+    monkeypatch.setenv("RAYON_NUM_THREADS", "")  # so undo() restores it
+    monkeypatch.delenv("RAYON_NUM_THREADS")
+    monkeypatch.setattr(importlib.util, "find_spec", fake_find_spec)
+    if not tokenizers_found:
+        monkeypatch.setitem(sys.modules, "tokenizers", None)
+    try:
+        importlib.reload(token_counter)
+        return os.environ.get("RAYON_NUM_THREADS")
+    finally:
+        monkeypatch.undo()
+        importlib.reload(token_counter)
+
+
+def test_tokenizer_thread_pool_capped(monkeypatch):
+    """Importing token_counter caps RAYON_NUM_THREADS when tokenizers exists."""
+    import token_counter
+
+    threads = _rayon_threads_after_import(monkeypatch, tokenizers_found=True)
+    assert int(threads) == min(
+        token_counter.MAX_TOKENIZER_THREADS, token_counter._available_cpus()
+    )
+
+
+def test_tokenizer_thread_pool_left_alone_without_tokenizers(monkeypatch):
+    """Without tokenizers, RAYON_NUM_THREADS stays unset for other libraries."""
+    assert _rayon_threads_after_import(monkeypatch, tokenizers_found=False) is None
+
+
+def test_null_token_counting_section_uses_defaults():
+    """A token_counting: null section behaves like a missing one."""
+    counter = TokenCounter({"token_counting": None})
+    assert counter.is_enabled() is True
+    assert counter.normalize(TokenCounter.DEFAULT_NORMALIZE_CAP) == 1.0
+
+
+def test_counter_instances_have_no_dict():
+    """TokenCounter declares __slots__, so instances carry no __dict__."""
+    counter = TokenCounter({})
+    assert not hasattr(counter, "__dict__")
+    with pytest.raises(AttributeError):
+        counter.unexpected = 1
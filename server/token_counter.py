@@ -1,30 +1,205 @@
 """Offline token counting using Xenova/claude-tokenizer for difficulty scoring.
 
-Uses the transformers library with GPT2TokenizerFast to load the
-Xenova/claude-tokenizer from Hugging Face for local, deterministic
-token counting. No API credentials required.
+Loads the Xenova/claude-tokenizer from Hugging Face for local,
+deterministic token counting. No API credentials required. The Rust
+tokenizers library is used directly when installed; otherwise the
+transformers library's GPT2TokenizerFast wrapper loads the same tokenizer.
+A tokenizers-loaded tokenizer is also saved as a local tokenizer.json
+(under LTM_TOKENIZER_CACHE, default ~/.cache/ltm/tokenizers) and later
+loaded from there without contacting the Hugging Face Hub.
 
-When transformers is not installed, falls back to a character-based
-approximation (num_chars / 3.5) for containerless environments.
+When neither is installed, falls back to a character-based
+approximation (num_chars / 3.5) for containerless environments, so
+counting stays enabled and difficulty scores keep their token signal.
 """
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Cap on the Rust tokenizer's rayon pool, which otherwise starts one thread
+# per CPU on the first encode_batch()
+MAX_TOKENIZER_THREADS = 4
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on, honouring affinity where supported."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
 try:
-    from transformers import GPT2TokenizerFast
-    _TRANSFORMERS_AVAILABLE = True
+    # rayon reads RAYON_NUM_THREADS once, so it must be set before tokenizers
+    # is imported; an explicit value is left alone, and nothing is set where
+    # tokenizers is missing (other rayon-based libraries keep their default)
+    if importlib.util.find_spec("tokenizers") is not None:
+        os.environ.setdefault(
+            "RAYON_NUM_THREADS",
+            str(min(MAX_TOKENIZER_THREADS, _available_cpus())),
+        )
+    from tokenizers import Tokenizer
+    _TOKENIZERS_AVAILABLE = True
 except ImportError:
-    _TRANSFORMERS_AVAILABLE = False
+    _TOKENIZERS_AVAILABLE = False
+
+# transformers imports a large module graph just to wrap the same Rust
+# tokenizer, so it is only tried where tokenizers itself is missing
+_TRANSFORMERS_AVAILABLE = False
+if not _TOKENIZERS_AVAILABLE:
+    try:
+        from transformers import GPT2TokenizerFast
+        _TRANSFORMERS_AVAILABLE = True
+    except ImportError:
+        pass
+
+# Loaded tokenizers keyed by model name, shared by all TokenCounter instances
+_TOKENIZER_CACHE: dict[str, Any] = {}
+
+# Serializes tokenizer loading, so concurrent first uses (e.g. a background
+# preload() and a count_tokens() call) never load a tokenizer twice
+_LOAD_LOCK = threading.Lock()
+
+
+def _strip_for_counting(tokenizer: Any) -> None:
+    """Drop the backend post-processor and decoder, which counting never uses.
+
+    Cached tokenizers are for counting only; do not decode() with them.
+    """
+    backend = getattr(tokenizer, "backend_tokenizer", tokenizer)
+    for component in ("post_processor", "decoder"):
+        try:
+            setattr(backend, component, None)
+        except Exception:
+            pass  # Keep the component if this tokenizers release rejects None
+
+
+def _warm_up(tokenizer: Any) -> None:
+    """Encode a throwaway text, so lazy setup is not paid by the first count."""
+    backend = getattr(tokenizer, "backend_tokenizer", tokenizer)
+    try:
+        backend.encode("warmup", add_special_tokens=False)
+    except Exception as e:
+        logger.debug(f"Tokenizer warmup failed: {e}")
+
+
+def _get_tokenizer(name: str) -> Any:
+    """Return the process-wide tokenizer for a model, loading it once.
+
+    Raises:
+        Exception: Whatever loading raises; nothing is cached on failure
+    """
+    tokenizer = _TOKENIZER_CACHE.get(name)
+    if tokenizer is not None:
+        return tokenizer
+
+    with _LOAD_LOCK:
+        tokenizer = _TOKENIZER_CACHE.get(name)
+        if tokenizer is None:
+            tokenizer = _load_tokenizer(name)
+            _strip_for_counting(tokenizer)
+            _warm_up(tokenizer)
+            _TOKENIZER_CACHE[name] = tokenizer
+            logger.info(f"Token counting enabled via {name}")
+    return tokenizer
+
+
+def _load_tokenizer(name: str) -> Any:
+    """Load a tokenizer, preferring tokenizers over transformers.
+
+    GPT2TokenizerFast wraps the same Rust tokenizer in a Python layer
+    (added-token handling, output conversion) that counting never needs,
+    so transformers is only used when tokenizers cannot be imported.
+    """
+    if not _TOKENIZERS_AVAILABLE:
+        return GPT2TokenizerFast.from_pretrained(name)
+
+    # The local copy only saves a Hub round trip, so any failure to locate
+    # or read it (no home directory, unreadable cache dir) falls through
+    local_path = None
+    try:
+        local_path = _local_tokenizer_path(name)
+        if local_path.is_file():
+            return Tokenizer.from_file(str(local_path))
+    except Exception as e:
+        logger.warning(f"Ignoring local tokenizer {local_path}: {e}")
+
+    tokenizer = Tokenizer.from_pretrained(name)
+    if local_path is not None:
+        _save_local_tokenizer(tokenizer, local_path)
+    return tokenizer
+
+
+def _local_tokenizer_path(name: str) -> Path:
+    """Where the local tokenizer.json copy for a model is kept."""
+    cache_dir = os.environ.get("LTM_TOKENIZER_CACHE")
+    if not cache_dir:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(xdg_cache) / "ltm" / "tokenizers"
+    return Path(cache_dir) / f"{name.replace('/', '--')}.json"
+
+
+def _save_local_tokenizer(tokenizer: Any, path: Path) -> None:
+    """Save a tokenizer.json copy via temp file + rename; failures only log."""
+    temp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".json")
+        os.close(fd)
+        tokenizer.save(temp_path)
+        os.replace(temp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not save local tokenizer {path}: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
 
 
 class TokenCounter:
     """Count tokens using offline Xenova/claude-tokenizer for difficulty scoring."""
 
+    __slots__ = (
+        "_tc_config",
+        "_normalize_cap",
+        "_tokenizer",
+        "_use_char_fallback",
+        "_count_cache",
+        "_longest_token_bytes",
+        "_enabled",
+        "_estimate_short",
+        "_approximate",
+        "_bytes_per_token",
+    )
+
     DEFAULT_NORMALIZE_CAP = 100000
+    TOKENIZER_NAME = "Xenova/claude-tokenizer"
+
+    # Max token counts remembered per counter, and the shortest text worth
+    # remembering (shorter texts are cheaper to tokenize than to hash)
+    COUNT_CACHE_SIZE = 4096
+    COUNT_CACHE_MIN_CHARS = 32
+
+    # Texts shorter than this are cached under the string itself, whose
+    # hash Python computes once per string object; longer ones under a
+    # 16-byte digest, which bounds the memory held by cache keys
+    COUNT_CACHE_DIGEST_CHARS = 256
+
+    # UTF-8 bytes per token in English and code, used by approximate mode
+    DEFAULT_BYTES_PER_TOKEN = 3.7
+
+    # Longest ASCII text estimated rather than tokenized when
+    # token_counting.estimate_short_text is set
+    SHORT_TEXT_MAX_CHARS = 8
 
     def __init__(self, config: dict | None = None):
         """
@@ -34,33 +209,96 @@ class TokenCounter:
             config: Configuration dict that may contain:
                 - token_counting.enabled: Whether to enable counting
                 - token_counting.normalize_cap: Max tokens for 1.0 score
+                - token_counting.estimate_short_text: Estimate short ASCII
+                  texts and whitespace-only texts from their length instead
+                  of tokenizing them
+                - token_counting.approximate: Estimate every text from its
+                  UTF-8 length and never load the tokenizer
+                - token_counting.bytes_per_token: Bytes per token assumed
+                  by approximate mode
+
+        The tokenizer is loaded on first use, so counters that are only
+        asked is_enabled() or normalize() never pay for loading it.
         """
-        self._config = config or {}
+        # The token_counting section, resolved once for every lookup below
+        self._tc_config = (config or {}).get("token_counting") or {}
+        self._normalize_cap = self._tc_config.get(
+            "normalize_cap", self.DEFAULT_NORMALIZE_CAP
+        )
         self._tokenizer = None
         self._use_char_fallback = False
-        self._enabled = self._initialize()
+        # Token counts keyed by text or its digest, least recently used first
+        self._count_cache: OrderedDict[str | bytes, int] = OrderedDict()
+        # Bytes in the longest vocabulary token (see _longest_token)
+        self._longest_token_bytes: int | None = None
+        self._enabled = self._tc_config.get("enabled") is not False
+        self._estimate_short = bool(
+            self._tc_config.get("estimate_short_text", False)
+        )
+        self._approximate = bool(self._tc_config.get("approximate", False))
+        self._bytes_per_token = self._resolve_bytes_per_token(
+            self._tc_config.get("bytes_per_token", self.DEFAULT_BYTES_PER_TOKEN)
+        )
+
+    @classmethod
+    def _resolve_bytes_per_token(cls, value: Any) -> float:
+        """Validate bytes_per_token, falling back to the default if unusable."""
+        try:
+            bytes_per_token = float(value)
+        except (TypeError, ValueError):
+            bytes_per_token = 0.0
+        if 0 < bytes_per_token < float("inf"):
+            return bytes_per_token
+        logger.warning(
+            f"Invalid token_counting.bytes_per_token {value!r}; "
+            f"using {cls.DEFAULT_BYTES_PER_TOKEN}"
+        )
+        return cls.DEFAULT_BYTES_PER_TOKEN
 
     def _initialize(self) -> bool:
         """Initialize the tokenizer from Hugging Face, or fall back to char-based."""
-        tc_config = self._config.get("token_counting", {})
-        if tc_config.get("enabled") is False:
+        if self._tc_config.get("enabled") is False:
             return False
 
-        if _TRANSFORMERS_AVAILABLE:
+        if _TOKENIZERS_AVAILABLE or _TRANSFORMERS_AVAILABLE:
             try:
-                self._tokenizer = GPT2TokenizerFast.from_pretrained(
-                    "Xenova/claude-tokenizer"
-                )
-                logger.info("Token counting enabled via Xenova/claude-tokenizer")
+                self._tokenizer = _get_tokenizer(self.TOKENIZER_NAME)
                 return True
             except Exception as e:
                 logger.warning(f"Tokenizer initialization failed: {e}")
 
         # Fall back to character-based estimation
         self._use_char_fallback = True
-        logger.info("Token counting enabled via char-based estimate (no transformers)")
+        logger.info("Token counting enabled via char-based estimate (no tokenizer)")
         return True
 
+    def _ensure_loaded(self) -> None:
+        """Load the tokenizer, or settle on the char fallback, on first use."""
+        if self._tokenizer is None and not self._use_char_fallback:
+            self._initialize()
+
+    def preload(self) -> threading.Thread | None:
+        """Start loading the tokenizer on a background thread.
+
+        Lets the load overlap other startup work; a count_tokens() call
+        made before it finishes waits for it instead of loading again.
+
+        Returns:
+            The loading thread, or None if there is nothing to load
+        """
+        if not self._enabled or self._approximate:
+            return None
+        thread = threading.Thread(
+            target=self._ensure_loaded, name="tokenizer-preload", daemon=True
+        )
+        thread.start()
+        return thread
+
+    @classmethod
+    def reset_cache(cls) -> None:
+        """Drop loaded tokenizers so the next instance loads them again."""
+        _TOKENIZER_CACHE.clear()
+
     def is_enabled(self) -> bool:
         """Check if token counting is enabled."""
         return self._enabled
@@ -68,34 +306,157 @@ class TokenCounter:
     @property
     def using_char_fallback(self) -> bool:
         """Check if using character-based fallback instead of real tokenizer."""
+        if self._approximate:
+            return True
+        if self._enabled:
+            self._ensure_loaded()
         return self._use_char_fallback
 
     @property
     def normalize_cap(self) -> int:
         """Get the normalization cap for token counts."""
-        return self._config.get("token_counting", {}).get(
-            "normalize_cap", self.DEFAULT_NORMALIZE_CAP
-        )
+        return self._normalize_cap
 
     def count_tokens(self, text: str | None) -> int:
         """Count tokens in text.
 
+        Counts are exact at any length, since callers accumulate them (e.g.
+        session token totals). Callers that only need the capped 0.0-1.0
+        score should use score(), which skips texts long enough to saturate.
+
         Args:
             text: Text to count tokens for
 
         Returns:
-            Token count, or 0 on error/disabled/empty
+            Token count, or 0 on error/disabled/empty/non-string
         """
-        if not self._enabled or not text:
+        if not self._enabled or not text or not isinstance(text, str):
             return 0
+        if self._approximate:
+            size = len(text) if text.isascii() else len(text.encode("utf-8"))
+            return int(size / self._bytes_per_token)
+        self._ensure_loaded()
         if self._use_char_fallback:
-            return int(len(text) / 3.5)
+            # len / 3.5 rounded down, in integer arithmetic
+            return len(text) * 2 // 7
+        return self._tokenizer_count(text)
+
+    def _tokenizer_count(self, text: str) -> int:
+        """Count a non-empty text with the loaded tokenizer, via the cache."""
+        key, count = self._known_count(text)
+        if count is None:
+            count = self._encode_length(text)
+            self._remember_count(key, count)
+        return count
+
+    def clear_cache(self) -> None:
+        """Forget remembered token counts, e.g. after swapping the tokenizer."""
+        self._count_cache.clear()
+
+    def _known_count(self, text: str) -> tuple[str | bytes | None, int | None]:
+        """Look up a count that needs no tokenizer call.
+
+        Returns:
+            (cache key, count): the key is None for texts too short to
+            cache, and the count is None when the text must be encoded
+        """
+        if (
+            self._estimate_short
+            and len(text) <= self.SHORT_TEXT_MAX_CHARS
+            and text.isascii()
+        ):
+            # Within about one token of the BPE count for short English text
+            return None, max(1, len(text) * 2 // 7)
+        if self._estimate_short and text.isspace():
+            # Runs of whitespace (e.g. padding in transcripts) merge into few
+            # tokens, and scanning for a non-space is far cheaper than BPE
+            return None, max(1, len(text) // 4)
+        if len(text) < self.COUNT_CACHE_MIN_CHARS:
+            return None, None
+
+        if len(text) < self.COUNT_CACHE_DIGEST_CHARS:
+            key: str | bytes = text
+        else:
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        count = self._count_cache.get(key)
+        if count is not None:
+            self._count_cache.move_to_end(key)
+        return key, count
+
+    def _remember_count(self, key: str | bytes | None, count: int) -> None:
+        """Remember a fresh count under its cache key (failures are not kept)."""
+        if key is None or not count:
+            return
+        cache = self._count_cache
+        cache[key] = count
+        if len(cache) > self.COUNT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _encode_length(self, text: str) -> int:
+        """Tokenize text and return its token count, or 0 on error."""
         try:
-            return len(self._tokenizer.encode(text))
+            # Encode with the Rust tokenizer (the wrapper's backend when
+            # loaded via transformers); its Encoding knows its length, where
+            # the wrapper's encode() would build a list of token IDs.
+            # Counting needs no special tokens, so post-processing is skipped
+            backend = getattr(self._tokenizer, "backend_tokenizer", self._tokenizer)
+            return len(backend.encode(text, add_special_tokens=False))
         except Exception as e:
             logger.warning(f"Token counting failed: {e}")
             return 0
 
+    def count_tokens_batch(self, texts: list[str | None]) -> list[int]:
+        """Count tokens in several texts with one tokenizer call.
+
+        Texts count_tokens() would answer without the tokenizer (remembered
+        counts, short-text estimates) are resolved first; the rest are
+        encoded together with the Rust tokenizer when one is loaded.
+        Results match count_tokens() for each text.
+
+        Args:
+            texts: Texts to count tokens for
+
+        Returns:
+            Token count per text, 0 for empty texts or on error/disabled
+        """
+        counts = [0] * len(texts)
+        if not self._enabled:
+            return counts
+        if self._approximate:
+            return [self.count_tokens(text) for text in texts]
+        self._ensure_loaded()
+
+        backend = getattr(self._tokenizer, "backend_tokenizer", self._tokenizer)
+        if self._use_char_fallback or backend is None:
+            return [self.count_tokens(text) for text in texts]
+
+        positions: list[int] = []
+        keys: list[str | bytes | None] = []
+        for i, text in enumerate(texts):
+            if not text or not isinstance(text, str):
+                continue
+            key, count = self._known_count(text)
+            if count is None:
+                positions.append(i)
+                keys.append(key)
+            else:
+                counts[i] = count
+        if not positions:
+            return counts
+
+        try:
+            encodings = backend.encode_batch(
+                [texts[i] for i in positions], add_special_tokens=False
+            )
+        except Exception as e:
+            logger.warning(f"Token counting failed: {e}")
+            return counts
+
+        for i, key, encoding in zip(positions, keys, encodings):
+            counts[i] = len(encoding)
+            self._remember_count(key, counts[i])
+        return counts
+
     def normalize(self, token_count: int) -> float:
         """Normalize token count to 0.0-1.0 score.
 
@@ -107,4 +468,53 @@ class TokenCounter:
         """
         if token_count <= 0:
             return 0.0
-        return min(1.0, token_count / self.normalize_cap)
+        if token_count >= self._normalize_cap:
+            return 1.0
+        return token_count / self._normalize_cap
+
+    def score(self, text: str | None) -> float:
+        """Normalized 0.0-1.0 score of the token count of text.
+
+        Equals normalize(count_tokens(text)) in one call, and texts too
+        long to score below 1.0 are not tokenized: no token spans more bytes
+        than the longest vocabulary entry, so a text of at least
+        normalize_cap times that many characters has at least normalize_cap
+        tokens.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            Normalized score between 0.0 and 1.0
+        """
+        if not self._enabled or not text or not isinstance(text, str):
+            return 0.0
+        if not self._approximate:
+            self._ensure_loaded()
+        cap = self._normalize_cap
+        if self._approximate or self._use_char_fallback:
+            count = self.count_tokens(text)
+        else:
+            longest = self._longest_token()
+            if longest and len(text) >= cap * longest:
+                return 1.0
+            count = self._tokenizer_count(text)
+
+        if count >= cap:
+            return 1.0
+        return count / cap if count > 0 else 0.0
+
+    def _longest_token(self) -> int:
+        """Bytes in the longest vocabulary token, or 0 if unknown.
+
+        Byte-level BPE spells each byte as one character, so a token's
+        length in the vocabulary is its length in bytes.
+        """
+        if self._longest_token_bytes is None:
+            try:
+                self._longest_token_bytes = max(
+                    map(len, self._tokenizer.get_vocab()), default=0
+                )
+            except Exception:
+                self._longest_token_bytes = 0
+        return self._longest_token_bytes